@@ -0,0 +1,251 @@
+"""
+Fingerprinted, precompressed frontend assets.
+
+build() copies each file in ASSETS to a content-hashed name such as
+styles.3f9a0c12d4e5.css and writes gzip and brotli variants next to it.
+The HTML pages are served with their /styles.css and /script.js references
+rewritten to /assets/<hashed name>; since a hashed name never changes
+content, those responses carry a one-year immutable Cache-Control. Every
+response is sent in the encoding the client gives the highest q-value
+(ties go to br, then gzip, then identity; q=0 refuses one). Pages carry an
+ETag per encoding, since each is a different byte sequence.
+
+Run `python assets.py` as a build step, or let the app build whatever is
+missing on startup. If the build fails (e.g. a read-only checkout) or
+ASSETS_FINGERPRINT=false, pages keep pointing at the raw /styles.css and
+/script.js, which are still served as before.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+try:
+    import brotli
+except ImportError:  # Optional; without it only gzip variants are built
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+FRONTEND_DIR = Path(__file__).parent.parent / "Frontend"
+OUTPUT_DIR = Path(os.getenv("ASSETS_DIR", str(FRONTEND_DIR / "dist")))
+FINGERPRINT = os.getenv("ASSETS_FINGERPRINT", "true").lower() in ("1", "true", "yes")
+
+ASSETS = ["styles.css", "script.js"]
+URL_PREFIX = "/assets/"
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Pages must be revalidated so a deploy's new asset names are picked up
+PAGE_CACHE_CONTROL = "no-cache"
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+# Content-Encoding -> suffix of a page's ETag
+ETAG_SUFFIXES = {None: "", "br": "-br", "gzip": "-gz"}
+
+
+def fingerprint(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:12]
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    stem, _, suffix = name.rpartition(".")
+    return f"{stem}.{fingerprint(content)}.{suffix}"
+
+
+def compress(content: bytes) -> Dict[str, bytes]:
+    """Encoded variants of content, keyed by Content-Encoding"""
+    variants = {}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, quality=11)
+    variants["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+    return variants
+
+
+def _write(path: Path, content: bytes):
+    # Hashed names are immutable, so an existing file is already up to date
+    if path.exists():
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def build(source_dir: Path = FRONTEND_DIR, output_dir: Path = OUTPUT_DIR) -> Dict[str, str]:
+    """Write hashed and compressed copies of ASSETS; return {name: hashed name}"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for name in ASSETS:
+        content = (source_dir / name).read_bytes()
+        target = hashed_name(name, content)
+        _write(output_dir / target, content)
+        for encoding, data in compress(content).items():
+            _write(output_dir / (target + ENCODINGS[encoding]), data)
+        manifest[name] = target
+    (output_dir / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def accepted_encodings(header: Optional[str]) -> Dict[str, float]:
+    """Codings in an Accept-Encoding header and their q-values, "*" included"""
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            accepted[coding] = quality
+    return accepted
+
+
+def negotiate(request: Request, available) -> Optional[str]:
+    """Encoding among available with the highest q-value, or None for identity
+
+    A coding the header does not name gets the q-value of "*", if any, and
+    is refused otherwise; identity is acceptable unless refused explicitly.
+    """
+    accepted = accepted_encodings(request.headers.get("accept-encoding"))
+    wildcard = accepted.get("*")
+    best, best_quality = None, accepted.get("identity", 1.0 if wildcard is None else wildcard)
+    # ENCODINGS is in order of preference, so an equal q-value keeps the earlier one
+    for encoding in reversed(ENCODINGS):
+        quality = accepted.get(encoding, wildcard or 0.0)
+        if encoding in available and quality > 0 and quality >= best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+class _Page:
+    """A rendered HTML page and its encoded variants, held in memory"""
+
+    def __init__(self, content: bytes):
+        self.variants = {None: content, **compress(content)}
+        digest = fingerprint(content)
+        self.etags = {encoding: f'"{digest}{ETAG_SUFFIXES[encoding]}"' for encoding in self.variants}
+
+
+class StaticAssets:
+    def __init__(self, source_dir: Path = FRONTEND_DIR, output_dir: Path = OUTPUT_DIR,
+                 enabled: bool = FINGERPRINT):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.manifest: Dict[str, str] = {}
+        self._files: Set[str] = set()
+        self._pages: Dict[str, _Page] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Build the assets and drop rendered pages; safe to call more than once"""
+        with self._lock:
+            manifest = {}
+            if self.enabled:
+                try:
+                    manifest = build(self.source_dir, self.output_dir)
+                except OSError as error:
+                    logger.warning("Asset build failed, serving raw files: %s", error)
+            self.manifest = manifest
+            self._files = {
+                target + suffix
+                for target in manifest.values()
+                for suffix in ("", *ENCODINGS.values())
+                if (self.output_dir / (target + suffix)).exists()
+            }
+            self._pages = {}
+            self._loaded = True
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def url(self, name: str) -> str:
+        """URL to reference name by, hashed if it was built"""
+        self._ensure_loaded()
+        target = self.manifest.get(name)
+        return URL_PREFIX + target if target else f"/{name}"
+
+    def _render(self, name: str) -> _Page:
+        page = self._pages.get(name)
+        if page is None:
+            html = (self.source_dir / name).read_text(encoding="utf-8")
+            for asset in self.manifest:
+                html = html.replace(f'"/{asset}"', f'"{self.url(asset)}"')
+            page = self._pages[name] = _Page(html.encode("utf-8"))
+        return page
+
+    def page(self, request: Request, name: str) -> Response:
+        """Serve an HTML page with rewritten asset URLs"""
+        self._ensure_loaded()
+        page = self._render(name)
+        encoding = negotiate(request, page.variants)
+        headers = {"Cache-Control": PAGE_CACHE_CONTROL, "Vary": "Accept-Encoding", "ETag": page.etags[encoding]}
+        if etag_matches(request.headers.get("if-none-match"), page.etags[encoding]):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(page.variants[encoding], media_type="text/html", headers=headers)
+
+    def asset(self, request: Request, filename: str) -> FileResponse:
+        """Serve a hashed asset in the best encoding the client accepts"""
+        self._ensure_loaded()
+        if filename not in self._files or filename.endswith(tuple(ENCODINGS.values())):
+            raise HTTPException(status_code=404, detail="Asset not found")
+        available = [encoding for encoding, suffix in ENCODINGS.items() if filename + suffix in self._files]
+        encoding = negotiate(request, available)
+        path = self.output_dir / (filename + ENCODINGS[encoding] if encoding else filename)
+        headers = {"Cache-Control": IMMUTABLE, "Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return FileResponse(path, media_type=mimetypes.guess_type(filename)[0], headers=headers)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Sizes in bytes of each built asset and its variants"""
+        self._ensure_loaded()
+        sizes = {}
+        for name, target in self.manifest.items():
+            variants = {"identity": (self.output_dir / target).stat().st_size}
+            for encoding, suffix in ENCODINGS.items():
+                if target + suffix in self._files:
+                    variants[encoding] = (self.output_dir / (target + suffix)).stat().st_size
+            sizes[target] = variants
+        return sizes
+
+
+static_assets = StaticAssets()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    static_assets.load()
+    if not static_assets.manifest:
+        raise SystemExit("No assets were built")
+    for target, variants in static_assets.stats().items():
+        print(target, " ".join(f"{encoding}={size}" for encoding, size in variants.items()))
@@ -1,17 +1,98 @@
+import asyncio
 import bcrypt
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
 from fastapi import Depends, HTTPException, status, Cookie
 from sqlalchemy.orm import Session
 import models
-from database import get_db
+import request_metrics
+import schemas
+from database import async_endpoint, get_db
 
 # JWT settings
 SECRET_KEY = "your-secret-key-change-this-in-production-09876543210"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
+# bcrypt cost factor and the dedicated hashing pool. bcrypt releases the GIL,
+# so threads run hashes in parallel without touching the shared threadpool.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 2)))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "32"))
+
+# Verified-token cache settings (a TTL of 0 disables the cache)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "1024"))
+
+
+class AdminCache:
+    """Bounded LRU of verified token -> admin identity with a TTL
+
+    Entries never outlive the token's own expiry. Tokens are also indexed by
+    username so admin changes can drop every token of that admin.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[schemas.Admin, float]]" = OrderedDict()
+        self._by_username: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[schemas.Admin]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return entry[0]
+
+    def set(self, token: str, admin: schemas.Admin, token_expires_at: float):
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (admin, min(time.time() + self.ttl_seconds, token_expires_at))
+            self._by_username.setdefault(admin.username, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_token(self, token: str):
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+
+    def invalidate_admin(self, username: str):
+        with self._lock:
+            for token in list(self._by_username.get(username, ())):
+                self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_username.clear()
+
+    def _remove(self, token: str):
+        admin, _ = self._entries.pop(token)
+        tokens = self._by_username.get(admin.username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_username[admin.username]
+
+
+admin_cache = AdminCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
     # Truncate password to 72 bytes for bcrypt
@@ -23,10 +104,79 @@ def get_password_hash(password: str) -> str:
     """Hash a password (truncate to 72 bytes for bcrypt)"""
     # Bcrypt has a 72-byte limit, so truncate if necessary
     password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
+class HashPool:
+    """Bounded executor for bcrypt work
+    
+    At most workers + queue_limit hashes are admitted at once; beyond that
+    run() fails fast with 503 instead of queueing without limit.
+    """
+    
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+    
+    async def run(self, fn, *args):
+        """Run fn(*args) on the pool and return its result"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password checks in progress, please retry",
+                headers={"Retry-After": "1"}
+            )
+        with self._lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._timed, fn, args
+            )
+        finally:
+            request_metrics.record_hash(time.perf_counter() - start)
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+    
+    def _timed(self, fn, args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rounds": BCRYPT_ROUNDS,
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": round(self.total_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 2),
+            }
+
+
+hash_pool = HashPool(HASH_WORKERS, HASH_QUEUE_LIMIT)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -38,40 +188,58 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify JWT token and return username"""
+def decode_token(token: str) -> Optional[dict]:
+    """Verify JWT token and return its payload"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
     except JWTError:
         return None
+    if payload.get("sub") is None:
+        return None
+    return payload
 
+def verify_token(token: str) -> Optional[str]:
+    """Verify JWT token and return username"""
+    cached = admin_cache.get(token)
+    if cached is not None:
+        return cached.username
+    payload = decode_token(token)
+    return payload["sub"] if payload else None
+
+@async_endpoint
 def get_current_admin(
     access_token: Optional[str] = Cookie(None),
     db: Session = Depends(get_db)
-) -> models.Admin:
-    """Get current authenticated admin from cookie"""
+) -> schemas.Admin:
+    """Get current authenticated admin from cookie
+    
+    Verified tokens are cached, so repeat requests skip both the signature
+    check and the admins lookup.
+    """
     if not access_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated"
         )
     
-    username = verify_token(access_token)
-    if username is None:
+    cached = admin_cache.get(access_token)
+    if cached is not None:
+        return cached
+    
+    payload = decode_token(access_token)
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
     
-    admin = db.query(models.Admin).filter(models.Admin.username == username).first()
+    admin = db.query(models.Admin).filter(models.Admin.username == payload["sub"]).first()
     if admin is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Admin not found"
         )
     
-    return admin
+    identity = schemas.Admin.model_validate(admin)
+    admin_cache.set(access_token, identity, payload["exp"])
+    return identity
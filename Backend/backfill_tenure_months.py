@@ -0,0 +1,103 @@
+"""
+Backfill Script for the tenure_months Columns
+
+Databases created before tenure_months existed have neither the columns nor
+the index, since create_all only creates missing tables. This script will:
+1. Add products.tenure_months and applications.tenure_months if missing
+2. Create the ix_products_tenure_months index if missing
+3. Set tenure_months from the free-text column wherever it is missing or
+   differs from what parse_tenure_months gives, and clear it where the text
+   cannot be parsed; re-running it after a parser change corrects old values
+
+migrations.py runs steps 1 and 3 as migration 0002 (and step 3 again as
+0007, after the parser stopped reading "90 days" as 90 months) and builds
+the index concurrently in 0003; this script remains for running the
+backfill alone.
+
+Tenure text has only a handful of distinct values, so the fill runs one
+UPDATE per distinct string rather than one per row.
+
+Usage:
+    python backfill_tenure_months.py
+"""
+
+import sys
+from sqlalchemy import inspect, text
+from database import engine
+from models import Product
+from tenure import parse_tenure_months
+
+# (table, free-text column)
+TARGETS = [
+    ("products", "tenure"),
+    ("applications", "tenure_selected"),
+]
+
+
+def add_missing_columns(conn):
+    """Add the tenure_months column to each target table that lacks it"""
+    inspector = inspect(conn)
+    for table, _ in TARGETS:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "tenure_months" in columns:
+            print(f"✓ {table}.tenure_months already exists")
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN tenure_months INTEGER"))
+        print(f"✓ Added {table}.tenure_months")
+
+
+def create_missing_index(conn):
+    """Create the products.tenure_months index if it does not exist"""
+    index = next(i for i in Product.__table__.indexes if i.name == "ix_products_tenure_months")
+    index.create(bind=conn, checkfirst=True)
+    print(f"✓ Index {index.name} in place")
+
+
+def backfill(conn):
+    """Sync tenure_months with the free-text column, one UPDATE per distinct value"""
+    for table, source in TARGETS:
+        values = conn.execute(text(f"SELECT DISTINCT {source} FROM {table}")).scalars().all()
+        updated = 0
+        cleared = 0
+        unparsed = []
+        for value in values:
+            months = parse_tenure_months(value)
+            if months is None:
+                unparsed.append(value)
+                result = conn.execute(
+                    text(f"UPDATE {table} SET tenure_months = NULL "
+                         f"WHERE {source} = :value AND tenure_months IS NOT NULL"),
+                    {"value": value}
+                )
+                cleared += result.rowcount
+                continue
+            result = conn.execute(
+                text(f"UPDATE {table} SET tenure_months = :months "
+                     f"WHERE {source} = :value AND (tenure_months IS NULL OR tenure_months <> :months)"),
+                {"months": months, "value": value}
+            )
+            updated += result.rowcount
+        print(f"✓ Backfilled {updated} rows in {table}")
+        if cleared:
+            print(f"  Cleared {cleared} rows whose tenure can no longer be parsed")
+        if unparsed:
+            print(f"  Could not parse {len(unparsed)} distinct values: {unparsed[:10]}")
+
+
+def main():
+    print("=" * 60)
+    print("DepositEase tenure_months Backfill")
+    print("=" * 60)
+    try:
+        with engine.begin() as conn:
+            add_missing_columns(conn)
+            create_missing_index(conn)
+            backfill(conn)
+    except Exception as e:
+        print(f"✗ Backfill failed: {e}")
+        sys.exit(1)
+    print("\n✓ Backfill completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
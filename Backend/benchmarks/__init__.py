@@ -0,0 +1,6 @@
+"""
+Benchmark and query-budget scripts for the DepositEase API.
+
+Run them from the Backend directory as modules, for example:
+    python -m benchmarks.query_budget
+"""
@@ -0,0 +1,123 @@
+"""
+Sync vs. async database mode under concurrent load.
+
+Boots the app with uvicorn once per DATABASE_MODE against the same seeded
+database, then drives it over HTTP with N concurrent clients for a fixed
+duration. Each client loops over a request mix of product listings by bank,
+bank details and application submissions. The catalog cache is turned off
+so every read reaches the database. Reports throughput, latency percentiles
+and errors per mode.
+
+Use PostgreSQL; SQLite serializes writers and is not meaningful here.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_async --database-url postgresql://... --clients 500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.common import create_schema, percentile, seed_catalog, start_server, use_database, wait_until_up
+
+# (weight, kind) pairs for the request mix
+MIX = [(70, "products_by_bank"), (20, "bank_detail"), (10, "create_application")]
+
+
+async def run_load(base_url: str, clients: int, duration: float, bank_ids, product_ids):
+    import httpx
+
+    kinds = [kind for weight, kind in MIX for _ in range(weight)]
+    latencies = []
+    errors = 0
+
+    async def one_client(client, rng):
+        nonlocal errors
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            kind = rng.choice(kinds)
+            start = time.perf_counter()
+            try:
+                if kind == "products_by_bank":
+                    response = await client.get("/products", params={"bank_id": rng.choice(bank_ids)})
+                elif kind == "bank_detail":
+                    response = await client.get(f"/banks/{rng.choice(bank_ids)}")
+                else:
+                    response = await client.post("/applications", json={
+                        "product_id": rng.choice(product_ids),
+                        "applicant_name": "Load Test",
+                        "phone": "01700000000",
+                        "deposit_amount": 50000,
+                        "tenure_selected": "12 months",
+                    })
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(one_client(client, random.Random(i)) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed and serve (default: throwaway SQLite file)")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per mode")
+    parser.add_argument("--banks", type=int, default=50)
+    parser.add_argument("--products-per-bank", type=int, default=20)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    database_url = use_database(args.database_url)
+    create_schema()
+    import models
+    from database import SessionLocal, engine
+
+    db = SessionLocal()
+    try:
+        if not db.query(models.Bank.id).first():
+            seed_catalog(db, args.banks, args.products_per_bank)
+        bank_ids = [row[0] for row in db.query(models.Bank.id)]
+        product_ids = [row[0] for row in db.query(models.Product.id)]
+    finally:
+        db.close()
+    engine.dispose()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"{args.clients} concurrent clients, {args.duration:.0f}s per mode, "
+          f"{len(bank_ids)} banks / {len(product_ids)} products")
+    print(f"  {'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in args.modes:
+        server = start_server(args.port, {"DATABASE_URL": database_url, "DATABASE_MODE": mode,
+                                          "CATALOG_CACHE_MAX_ENTRIES": "0"})
+        try:
+            asyncio.run(wait_until_up(base_url))
+            result = asyncio.run(run_load(base_url, args.clients, args.duration, bank_ids, product_ids))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"  {mode:<6} {result['throughput']:8.0f} {result['p50_ms']:8.1f} "
+              f"{result['p95_ms']:8.1f} {result['p99_ms']:8.1f} {result['errors']:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Authenticated request throughput with and without the verified-token cache.
+
+Logs in once, then resolves the admin repeatedly, first with the cache
+disabled (JWT decode + admins SELECT per request) and then enabled. Reports
+the get_current_admin dependency on its own and full GET /auth/me requests
+through the in-process test client, whose own overhead dominates the latter.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_auth --requests 2000
+"""
+
+import argparse
+
+from benchmarks.common import StatementCounter, create_schema, timer, use_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--database-url", default=None,
+                        help="Database to use (default: throwaway SQLite file)")
+    args = parser.parse_args()
+
+    use_database(args.database_url)
+    create_schema()
+    from fastapi.testclient import TestClient
+    import auth
+    import main as app_module
+    from database import SessionLocal, engine
+
+    client = TestClient(app_module.app)
+    credentials = {"username": "bench-admin", "password": "bench-password"}
+    client.post("/auth/register", json=credentials)
+    client.post("/auth/login", json=credentials).raise_for_status()
+
+    token = client.cookies.get("access_token")
+
+    def dependency():
+        db = SessionLocal()
+        try:
+            auth.get_current_admin(access_token=token, db=db)
+        finally:
+            db.close()
+
+    def request():
+        client.get("/auth/me").raise_for_status()
+
+    for name, call in (("get_current_admin", dependency), ("GET /auth/me", request)):
+        print(f"{name} x {args.requests}")
+        for label, ttl in (("cache off (before)", 0), ("cache on (after)", 60)):
+            auth.admin_cache.clear()
+            auth.admin_cache.ttl_seconds = ttl
+            with StatementCounter(engine) as counter, timer() as elapsed:
+                for _ in range(args.requests):
+                    call()
+            rate = args.requests / elapsed["seconds"]
+            print(f"  {label:<20} {rate:9.0f} /s  {counter.count:6d} statements")
+
+
+if __name__ == "__main__":
+    main()
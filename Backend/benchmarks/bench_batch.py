@@ -0,0 +1,72 @@
+"""
+Batch application intake benchmark.
+
+Submits N applications through one POST /applications/batch call and,
+for reference, a sample of single POST /applications calls, reporting wall
+time, rows per second and SQL statements for each.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_batch --rows 10000
+    python -m benchmarks.bench_batch --database-url postgresql://...
+"""
+
+import argparse
+
+from benchmarks.common import StatementCounter, create_schema, seed_catalog, timer, use_database
+
+
+def application(product_id: int, i: int) -> dict:
+    return {
+        "product_id": product_id,
+        "applicant_name": f"Kiosk Applicant {i}",
+        "phone": f"017{i:08d}",
+        "email": f"applicant{i}@example.com",
+        "deposit_amount": 10000 + i,
+        "tenure_selected": ("6 months", "1 year", "24 months", "3 years")[i % 4],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--single-sample", type=int, default=500,
+                        help="Single POSTs to time for the per-row baseline")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed (default: throwaway SQLite file)")
+    args = parser.parse_args()
+
+    use_database(args.database_url)
+    create_schema()
+    from fastapi.testclient import TestClient
+    import main as app_module
+    from database import SessionLocal, async_engine, engine
+
+    db = SessionLocal()
+    seed_catalog(db, 10, 10)
+    product_ids = [row[0] for row in db.query(app_module.models.Product.id)]
+    db.close()
+
+    # One event loop for all requests, as async mode pools connections per loop
+    with TestClient(app_module.app) as client:
+        counted = async_engine.sync_engine if async_engine else engine
+        batch = [application(product_ids[i % len(product_ids)], i) for i in range(args.rows)]
+
+        with StatementCounter(counted) as counter, timer() as elapsed:
+            response = client.post("/applications/batch", json={"applications": batch})
+        response.raise_for_status()
+        result = response.json()
+        print(f"POST /applications/batch, {args.rows} rows")
+        print(f"  {elapsed['seconds'] * 1000:8.0f} ms  {args.rows / elapsed['seconds']:9.0f} rows/s  "
+              f"{counter.count} statements  created={result['created']} failed={result['failed']}")
+
+        sample = batch[:args.single_sample]
+        with StatementCounter(counted) as counter, timer() as elapsed:
+            for row in sample:
+                client.post("/applications", json=row).raise_for_status()
+        print(f"POST /applications x {len(sample)} (per-row baseline)")
+        print(f"  {elapsed['seconds'] * 1000:8.0f} ms  {len(sample) / elapsed['seconds']:9.0f} rows/s  "
+              f"{counter.count} statements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+POST /products/compare benchmark.
+
+Seeds N products, then reports the median latency of the endpoint with a
+warm catalog snapshot and right after invalidation (snapshot reload), of the
+vectorized calculation alone, and of a per-product Python loop doing the same
+arithmetic for reference.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_compare --products 50000
+    python -m benchmarks.bench_compare --database-url postgresql://...
+"""
+
+import argparse
+import statistics
+
+from benchmarks.common import create_schema, seed_catalog, timer, use_database
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        with timer() as elapsed:
+            fn()
+        samples.append(elapsed["seconds"])
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--products-per-bank", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed (default: throwaway SQLite file)")
+    args = parser.parse_args()
+
+    use_database(args.database_url)
+    create_schema()
+    import numpy as np
+    from fastapi.testclient import TestClient
+    import compare
+    import main as app_module
+    from database import SessionLocal
+
+    db = SessionLocal()
+    seed_catalog(db, max(1, args.products // args.products_per_bank), args.products_per_bank)
+    db.close()
+
+    client = TestClient(app_module.app)
+    body = {"principal": 100000, "limit": 100}
+    total = client.post("/products/compare", json=body).json()["total"]
+
+    rng = np.random.default_rng(0)
+    rates = rng.uniform(3, 10, total)
+    frequencies = rng.choice(["Monthly", "Quarterly", "Yearly", None], total).tolist()
+    months = rng.choice([6, 12, 24, 36, 60], total)
+
+    periods = compare.periods_per_year(frequencies)
+
+    def vectorized():
+        amount, annual_yield = compare.maturity(100000, rates, periods, months)
+        compare.rank(amount, annual_yield)
+
+    def cold_endpoint():
+        compare.invalidate()
+        client.post("/products/compare", json=body)
+
+    def python_loop():
+        results = []
+        for rate, frequency, month in zip(rates.tolist(), frequencies, months.tolist()):
+            n = compare.PERIODS_PER_YEAR.get((frequency or "").lower(), 0)
+            r = rate / 100
+            if n:
+                results.append((100000 * (1 + r / n) ** (n * month / 12), (1 + r / n) ** n - 1))
+            else:
+                results.append((100000 * (1 + r * month / 12), r))
+        results.sort(reverse=True)
+
+    print(f"{total} matching products, median of {args.repeat} runs")
+    print(f"  endpoint, warm snapshot          {median_ms(lambda: client.post('/products/compare', json=body), args.repeat):8.1f} ms")
+    print(f"  endpoint after invalidate()       {median_ms(cold_endpoint, args.repeat):8.1f} ms")
+    print(f"  vectorized calculation            {median_ms(vectorized, args.repeat):8.1f} ms")
+    print(f"  per-product Python loop           {median_ms(python_loop, args.repeat):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
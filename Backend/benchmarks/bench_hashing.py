@@ -0,0 +1,83 @@
+"""
+Password hashing benchmark.
+
+Reports the median bcrypt hash latency for a range of cost factors, then fires
+concurrent POST /auth/login requests through the dedicated hashing pool and
+reports how many succeeded, how many were turned away with 503 and the
+latency percentiles of the successful ones.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_hashing --rounds 10 11 12 13 --logins 64
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from benchmarks.common import create_schema, timer, use_database
+
+
+def hash_latency_ms(rounds: int, repeat: int) -> float:
+    import bcrypt
+
+    samples = []
+    for _ in range(repeat):
+        with timer() as elapsed:
+            bcrypt.hashpw(b"bench-password", bcrypt.gensalt(rounds=rounds))
+        samples.append(elapsed["seconds"])
+    return statistics.median(samples) * 1000
+
+
+async def login_burst(app, credentials: dict, logins: int):
+    import httpx
+
+    async def login(client):
+        with timer() as elapsed:
+            response = await client.post("/auth/login", json=credentials)
+        return response.status_code, elapsed["seconds"]
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        with timer() as total:
+            results = await asyncio.gather(*(login(client) for _ in range(logins)))
+    return results, total["seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--logins", type=int, default=64,
+                        help="Concurrent logins to send through the pool")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to use (default: throwaway SQLite file)")
+    args = parser.parse_args()
+
+    print(f"bcrypt hash latency, median of {args.repeat}")
+    for rounds in args.rounds:
+        print(f"  rounds={rounds:<3} {hash_latency_ms(rounds, args.repeat):8.1f} ms")
+
+    use_database(args.database_url)
+    create_schema()
+    from fastapi.testclient import TestClient
+    import auth
+    import main as app_module
+
+    credentials = {"username": "bench-admin", "password": "bench-password"}
+    TestClient(app_module.app).post("/auth/register", json=credentials)
+
+    pool = auth.hash_pool
+    print(f"\n{args.logins} concurrent logins, rounds={auth.BCRYPT_ROUNDS}, "
+          f"workers={pool.workers}, queue_limit={pool.queue_limit}")
+    results, seconds = asyncio.run(login_burst(app_module.app, credentials, args.logins))
+    ok = sorted(elapsed for code, elapsed in results if code == 200)
+    rejected = sum(1 for code, _ in results if code == 503)
+    print(f"  200: {len(ok)}  503: {rejected}  other: {len(results) - len(ok) - rejected}"
+          f"  wall: {seconds * 1000:.0f} ms")
+    if ok:
+        p95 = ok[min(len(ok) - 1, int(len(ok) * 0.95))]
+        print(f"  login latency p50 {statistics.median(ok) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms")
+    print(f"  pool stats: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
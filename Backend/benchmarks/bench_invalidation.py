@@ -0,0 +1,98 @@
+"""
+Cross-worker cache invalidation latency.
+
+Starts two servers on the same PostgreSQL database, standing in for two
+workers, and caches a product on both. Each round updates the product's
+interest rate through the first server, then polls the second until it
+serves the new rate, and reports how long that took. It also checks that a
+second product, whose cache entry no update touches, is still served from
+the second server's cache at the end.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_invalidation --database-url postgresql://... --rounds 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import create_schema, percentile, seed_catalog, start_server, use_database, wait_until_up
+
+
+async def run(urls, product_id: int, other_id: int, rounds: int, cookies: dict):
+    import httpx
+
+    writer = httpx.AsyncClient(base_url=urls[0])
+    reader = httpx.AsyncClient(base_url=urls[1], cookies=cookies)
+    try:
+        for client in (writer, reader):
+            for path in (f"/products/{product_id}", f"/products/{other_id}"):
+                (await client.get(path)).raise_for_status()
+        latencies, polls = [], 0
+        for i in range(rounds):
+            rate = round(5.0 + (i % 50) / 10 + 0.01, 2)
+            (await writer.put(f"/products/{product_id}", json={"interest_rate": rate})).raise_for_status()
+            start = time.perf_counter()
+            while True:
+                polls += 1
+                if (await reader.get(f"/products/{product_id}")).json()["interest_rate"] == rate:
+                    break
+                if time.perf_counter() - start > 5:
+                    raise SystemExit(f"round {i}: the second server still serves a stale product after 5s")
+            latencies.append(time.perf_counter() - start)
+        hits = (await reader.get("/stats/cache")).json()["catalog"]["hits"]
+        (await reader.get(f"/products/{other_id}")).raise_for_status()
+        other_cached = (await reader.get("/stats/cache")).json()["catalog"]["hits"] == hits + 1
+    finally:
+        await writer.aclose()
+        await reader.aclose()
+    return sorted(latencies), polls, other_cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="PostgreSQL database to seed and serve")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+
+    database_url = use_database(args.database_url)
+    create_schema()
+    import auth
+    import models
+    from database import SessionLocal, engine
+
+    db = SessionLocal()
+    if not db.query(models.Bank.id).first():
+        seed_catalog(db, 5, 5)
+    product_id, other_id = [row[0] for row in db.query(models.Product.id).order_by(models.Product.id).limit(2)]
+    if not db.query(models.Admin.id).filter(models.Admin.username == "bench-invalidation").first():
+        db.add(models.Admin(username="bench-invalidation", password_hash="!"))
+        db.commit()
+    db.close()
+    engine.dispose()
+    cookies = {"access_token": auth.create_access_token({"sub": "bench-invalidation"})}
+
+    env = {"DATABASE_URL": database_url, "DATABASE_MODE": args.mode, "CACHE_INVALIDATION": "postgres"}
+    ports = [args.port, args.port + 1]
+    urls = [f"http://127.0.0.1:{port}" for port in ports]
+    servers = [start_server(port, env) for port in ports]
+    try:
+        for url in urls:
+            asyncio.run(wait_until_up(url))
+        latencies, polls, other_cached = asyncio.run(run(urls, product_id, other_id, args.rounds, cookies))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+    print(f"{args.rounds} updates through server 1, {args.mode} mode; time until server 2 serves them")
+    print(f"  p50 {percentile(latencies, 0.50) * 1000:.1f} ms  p95 {percentile(latencies, 0.95) * 1000:.1f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms  max {latencies[-1] * 1000:.1f} ms  "
+          f"({polls / args.rounds:.1f} polls per update)")
+    print(f"  unrelated product still cached on server 2: {'yes' if other_cached else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
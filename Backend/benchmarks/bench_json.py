@@ -0,0 +1,174 @@
+"""
+Catalog list serialization benchmark.
+
+Times the GET /products and GET /banks bodies at each row count along three
+paths, query included, and reports latency and output bytes per second:
+
+- response_model: ORM objects validated into the schemas, then
+  jsonable_encoder and json.dumps (FastAPI's default response path)
+- pydantic: ORM objects validated and dumped by a TypeAdapter
+- catalog_json: plain rows dumped with orjson (what the endpoints use)
+- fields=: the same with only the fields the home page grid and the admin
+  bank table show (HOME_GRID_FIELDS, BANK_TABLE_FIELDS)
+
+Each full path's output is checked to decode to the same data as response_model
+(ignoring the order of a bank's products, which selectinload leaves to the
+database).
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_json --rows 1000 10000
+    python -m benchmarks.bench_json --database-url postgresql://...
+"""
+
+import argparse
+import json
+import statistics
+from typing import List
+
+from benchmarks.common import create_schema, seed_catalog, timer, use_database
+
+
+HOME_GRID_FIELDS = "type,interest_rate,min_deposit,tenure,key_features,bank.name"
+BANK_TABLE_FIELDS = "name,products.id"
+
+
+def normalize(data):
+    for item in data:
+        if "products" in item:
+            item["products"].sort(key=lambda product: product["id"])
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--products-per-bank", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed (default: throwaway SQLite file)")
+    args = parser.parse_args()
+
+    use_database(args.database_url)
+    create_schema()
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlalchemy.orm import contains_eager, selectinload
+    import catalog_json
+    import models
+    import schemas
+    from database import SessionLocal
+
+    db = SessionLocal()
+    seed_catalog(db, max(1, max(args.rows) // args.products_per_bank), args.products_per_bank)
+    db.close()
+
+    def product_objects(db, rows):
+        return (
+            db.query(models.Product).join(models.Product.bank)
+            .options(contains_eager(models.Product.bank))
+            .order_by(models.Product.id).limit(rows).all()
+        )
+
+    def bank_objects(db, rows):
+        return (
+            db.query(models.Bank).options(selectinload(models.Bank.products))
+            .order_by(models.Bank.id).limit(rows // args.products_per_bank).all()
+        )
+
+    def response_model(adapter, load):
+        def run(db, rows):
+            data = jsonable_encoder(adapter.validate_python(load(db, rows), from_attributes=True))
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return run
+
+    def pydantic(adapter, load):
+        def run(db, rows):
+            return adapter.dump_json(adapter.validate_python(load(db, rows), from_attributes=True))
+        return run
+
+    def fast_products(db, rows):
+        return catalog_json.products_with_bank(
+            db.query(*catalog_json.PRODUCT_COLUMNS, *catalog_json.BANK_COLUMNS)
+            .select_from(models.Product).join(models.Product.bank)
+            .order_by(models.Product.id).limit(rows).all()
+        )
+
+    def fast_banks(db, rows):
+        banks = (
+            db.query(*catalog_json.BANK_COLUMNS)
+            .order_by(models.Bank.id).limit(rows // args.products_per_bank).all()
+        )
+        products = (
+            db.query(models.Product.bank_id, *catalog_json.PRODUCT_COLUMNS)
+            .filter(models.Product.bank_id.in_([bank.id for bank in banks]))
+            .order_by(models.Product.id).all()
+        )
+        return catalog_json.banks_with_products(banks, products)
+
+    def sparse_products(db, rows):
+        fields, bank_fields = catalog_json.parse_fields(
+            HOME_GRID_FIELDS, catalog_json.PRODUCT_FIELDS, "bank", catalog_json.BANK_FIELDS
+        )
+        return catalog_json.products_with_bank(
+            db.query(*catalog_json.product_columns(fields), *catalog_json.bank_columns(bank_fields))
+            .select_from(models.Product).join(models.Product.bank)
+            .order_by(models.Product.id).limit(rows).all(),
+            fields, bank_fields,
+        )
+
+    def sparse_banks(db, rows):
+        fields, product_fields = catalog_json.parse_fields(
+            BANK_TABLE_FIELDS, catalog_json.BANK_FIELDS, "products", catalog_json.PRODUCT_FIELDS
+        )
+        banks = (
+            db.query(*catalog_json.bank_columns(fields))
+            .order_by(models.Bank.id).limit(rows // args.products_per_bank).all()
+        )
+        products = (
+            db.query(models.Product.bank_id, *catalog_json.product_columns(product_fields))
+            .filter(models.Product.bank_id.in_([bank.id for bank in banks]))
+            .order_by(models.Product.id).all()
+        )
+        return catalog_json.banks_with_products(banks, products, fields, product_fields)
+
+    product_list = TypeAdapter(List[schemas.ProductWithBank])
+    bank_list = TypeAdapter(List[schemas.BankWithProducts])
+    endpoints = {
+        "GET /products": {
+            "response_model": response_model(product_list, product_objects),
+            "pydantic": pydantic(product_list, product_objects),
+            "catalog_json": fast_products,
+            "fields=": sparse_products,
+        },
+        "GET /banks": {
+            "response_model": response_model(bank_list, bank_objects),
+            "pydantic": pydantic(bank_list, bank_objects),
+            "catalog_json": fast_banks,
+            "fields=": sparse_banks,
+        },
+    }
+
+    for endpoint, paths in endpoints.items():
+        for rows in args.rows:
+            print(f"{endpoint}, {rows} products, median of {args.repeat} runs")
+            expected = None
+            for label, run in paths.items():
+                samples = []
+                for _ in range(args.repeat):
+                    db = SessionLocal()
+                    with timer() as elapsed:
+                        body = run(db, rows)
+                    db.close()
+                    samples.append(elapsed["seconds"])
+                decoded = normalize(json.loads(body))
+                if expected is None:
+                    expected = decoded
+                elif label != "fields=" and decoded != expected:
+                    raise SystemExit(f"{label} output differs from response_model for {endpoint}")
+                seconds = statistics.median(samples)
+                print(f"  {label:<15} {seconds * 1000:8.1f} ms  {len(body) / 1e6:7.2f} MB  "
+                      f"{len(body) / seconds / 1e6:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
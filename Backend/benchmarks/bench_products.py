@@ -0,0 +1,62 @@
+"""
+Product listing benchmark: lazy Product.bank loading vs. the joined load used
+by GET /products.
+
+Seeds N products, then times the full list path (query + ProductWithBank
+serialization) under both loading strategies and reports statements and
+median latency. Each run uses a fresh session, so the lazy strategy pays for
+every distinct bank it touches.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_products --products 10000
+"""
+
+import argparse
+import statistics
+from typing import List
+
+from benchmarks.common import StatementCounter, create_schema, seed_catalog, timer, use_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--products-per-bank", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed (default: throwaway SQLite file)")
+    args = parser.parse_args()
+
+    use_database(args.database_url)
+    create_schema()
+    from pydantic import TypeAdapter
+    from sqlalchemy.orm import joinedload, lazyload
+    import models
+    import schemas
+    from database import SessionLocal, engine
+
+    db = SessionLocal()
+    seed_catalog(db, max(1, args.products // args.products_per_bank), args.products_per_bank)
+    db.close()
+
+    adapter = TypeAdapter(List[schemas.ProductWithBank])
+    strategies = {
+        "lazy (before)": lazyload(models.Product.bank),
+        "joined (after)": joinedload(models.Product.bank),
+    }
+
+    print(f"{args.products} products, median of {args.repeat} runs")
+    for label, option in strategies.items():
+        samples = []
+        for _ in range(args.repeat):
+            db = SessionLocal()
+            with StatementCounter(engine) as counter, timer() as elapsed:
+                products = db.query(models.Product).options(option).limit(args.products).all()
+                adapter.dump_json(adapter.validate_python(products, from_attributes=True))
+            db.close()
+            samples.append(elapsed["seconds"])
+        print(f"  {label:<16} {statistics.median(samples) * 1000:9.1f} ms  {counter.count:6d} statements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Check that a product CSV import only changes what the file contains.
+
+Seeds a throwaway database, deactivates a product and fills in its optional
+fields, then imports a CSV with the required columns and an empty
+max_deposit column (updating one product by id and one by bank and name)
+and fails (exit code 1) if any field the file did not fill in changed, or
+if a new product in the same file did not get the defaults.
+
+Usage (from the Backend directory):
+    python -m benchmarks.check_csv_import
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from benchmarks.common import create_schema, seed_catalog, use_database
+
+UNTOUCHED = [
+    "product_overview", "key_features", "withdrawal_rules", "eligibility_criteria", "required_documents",
+    "max_deposit", "compounding_frequency", "premature_withdrawal_penalty", "is_active",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+
+    use_database()
+    create_schema()
+    from fastapi.testclient import TestClient
+    import auth
+    import main as app_module
+    import models
+    import schemas
+    from database import SessionLocal
+
+    db = SessionLocal()
+    bank_id = seed_catalog(db, 1, 2)[0]
+    by_id, by_name = db.query(models.Product).filter(models.Product.bank_id == bank_id).order_by(models.Product.id)
+    by_id.is_active = False
+    by_id.max_deposit = 500000
+    by_name.compounding_frequency = "Monthly"
+    db.commit()
+    before = {
+        product.id: {field: getattr(product, field) for field in UNTOUCHED}
+        for product in (by_id, by_name)
+    }
+    by_id_id, by_name_id, by_name_name = by_id.id, by_name.id, by_name.name
+    db.close()
+
+    app_module.app.dependency_overrides[auth.get_current_admin] = lambda: schemas.Admin(
+        id=0, username="check", created_at=datetime.now()
+    )
+    client = TestClient(app_module.app)
+    body = "\n".join([
+        "id,bank_id,name,type,interest_rate,min_deposit,tenure,max_deposit",
+        f"{by_id_id},{bank_id},Renamed,Fixed Deposit,9.5,1000,24 months,",
+        f",{bank_id},{by_name_name},DPS,8.25,2000,12 months,",
+        f",{bank_id},Brand New,DPS,7,500,6 months,",
+    ])
+    response = client.post("/admin/import/products", files={"file": ("products.csv", body, "text/csv")})
+    response.raise_for_status()
+    print(f"     import: {response.json()}")
+
+    db = SessionLocal()
+    failed = False
+    for product_id, label in ((by_id_id, "by id"), (by_name_id, "by bank and name")):
+        product = db.get(models.Product, product_id)
+        changed = {
+            field: (value, getattr(product, field))
+            for field, value in before[product_id].items() if getattr(product, field) != value
+        }
+        ok = not changed
+        failed = failed or not ok
+        print(f"{'OK  ' if ok else 'FAIL'} update {label} leaves unlisted fields alone"
+              + ("" if ok else f": changed {changed}"))
+
+    renamed = db.get(models.Product, by_id_id)
+    matched = db.get(models.Product, by_name_id)
+    listed = (renamed.name == "Renamed" and renamed.interest_rate == 9.5 and renamed.tenure_months == 24
+              and matched.interest_rate == 8.25 and matched.min_deposit == 2000)
+    failed = failed or not listed
+    print(f"{'OK  ' if listed else 'FAIL'} updates write the fields the file fills in")
+
+    new = db.query(models.Product).filter(models.Product.name == "Brand New").one_or_none()
+    defaults = new is not None and new.is_active and new.max_deposit is None
+    failed = failed or not defaults
+    print(f"{'OK  ' if defaults else 'FAIL'} new product gets the defaults")
+    db.close()
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Consistency check for the summary dashboard counters under concurrent writes.
+
+Runs with DASHBOARD_STATS_MODE=summary and fails (exit code 1) if:
+- several dashboard loads that all find the counters table empty, and so all
+  rebuild it at once, raise an error
+- after writer threads create banks, products and applications and move
+  applications between statuses while another thread keeps rebuilding the
+  counters, the counters differ from a recount of the tables
+
+Usage (from the Backend directory):
+    python -m benchmarks.check_dashboard_counters
+    python -m benchmarks.check_dashboard_counters --database-url postgresql://... --writers 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+from datetime import datetime
+
+from benchmarks.common import create_schema, seed_applications, seed_catalog, use_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Database to use (default: a throwaway SQLite file)")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=50, help="Writes per writer thread")
+    args = parser.parse_args()
+
+    use_database(args.database_url)
+    os.environ["DASHBOARD_STATS_MODE"] = "summary"
+    create_schema()
+    from sqlalchemy import delete
+
+    import dashboard
+    import models
+    from database import SessionLocal
+
+    db = SessionLocal()
+    bank_ids = seed_catalog(db, 5, 4)
+    product_ids = [product_id for product_id, in db.query(models.Product.id)]
+    seed_applications(db, product_ids, 500)
+    db.execute(delete(models.DashboardCounter))
+    db.commit()
+    db.close()
+
+    failed = False
+    errors = []
+
+    def run(target, *target_args):
+        session = SessionLocal()
+        try:
+            target(session, *target_args)
+        except Exception as error:
+            errors.append(f"{target.__name__}: {error!r}")
+        finally:
+            session.close()
+
+    # Every load finds no counters and rebuilds them
+    start = threading.Barrier(args.writers)
+
+    def first_load(session):
+        start.wait()
+        dashboard.summary_stats(session)
+
+    threads = [threading.Thread(target=run, args=(first_load,)) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"{'FAIL' if errors else 'OK  '} {args.writers} concurrent first-use rebuilds")
+    failed = failed or bool(errors)
+    for error in errors:
+        print(f"     {error}")
+    errors.clear()
+
+    # The writes the endpoints make, each with its counter update in the same transaction
+    def write(session, seed):
+        rng = random.Random(seed)
+        for i in range(args.writes):
+            kind = rng.choice(["bank", "product", "application", "review"])
+            if kind == "bank":
+                session.add(models.Bank(name=f"Check Bank {seed}-{i}"))
+                dashboard.record(session, {dashboard.TOTAL_BANKS: 1})
+            elif kind == "product":
+                session.add(models.Product(
+                    bank_id=rng.choice(bank_ids), name=f"Check Product {seed}-{i}", type="DPS",
+                    interest_rate=7.0, min_deposit=1000, tenure="12 months"
+                ))
+                dashboard.record(session, {dashboard.TOTAL_PRODUCTS: 1})
+            elif kind == "application":
+                session.add(models.Application(
+                    product_id=rng.choice(product_ids), applicant_name="Check", phone="01700000000",
+                    email="check@example.com", nid_number="1234567890", address="Dhaka",
+                    deposit_amount=5000, tenure_selected="12 months", status="pending"
+                ))
+                dashboard.record_transition(session, [], dashboard.application_keys("pending", None))
+            else:
+                low = rng.randint(1, 480)
+                dashboard.update_applications(session, [models.Application.id.between(low, low + 20)], {
+                    "status": rng.choice(["pending", "approved", "rejected"]),
+                    "reviewed_by": "check",
+                    "reviewed_at": datetime.now(),
+                })
+            session.commit()
+
+    done = threading.Event()
+
+    def keep_rebuilding(session):
+        while not done.is_set():
+            dashboard.rebuild(session)
+            session.commit()
+
+    rebuilder = threading.Thread(target=run, args=(keep_rebuilding,))
+    rebuilder.start()
+    threads = [threading.Thread(target=run, args=(write, seed)) for seed in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    rebuilder.join()
+
+    db = SessionLocal()
+    counted = dashboard.summary_stats(db)
+    recounted = dashboard.aggregate_stats(db)
+    db.close()
+    mismatch = errors or counted != recounted
+    print(f"{'FAIL' if mismatch else 'OK  '} {args.writers}x{args.writes} writes during rebuilds: "
+          f"counters {counted}, recount {recounted}")
+    for error in errors:
+        print(f"     {error}")
+    failed = failed or mismatch
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
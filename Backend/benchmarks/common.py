@@ -0,0 +1,171 @@
+"""
+Shared helpers for the benchmark scripts.
+
+use_database() must be called before main/database are imported, because
+database.py reads DATABASE_URL at import time. Importing main does not
+create the tables; create_schema() does.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event, insert
+
+
+def use_database(url=None):
+    """Point the app at url, or at a fresh throwaway SQLite file if url is None"""
+    if url is None:
+        fd, path = tempfile.mkstemp(prefix="depositease-bench-", suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = url
+    return url
+
+
+def create_schema():
+    """Bring the database use_database() pointed at up to the current schema"""
+    import io
+    from contextlib import redirect_stdout
+
+    import migrations
+
+    with redirect_stdout(io.StringIO()):
+        migrations.upgrade()
+
+
+class StatementCounter:
+    """Count SQL statements sent through an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def start_server(port: int, env: dict, workers: int = 1) -> subprocess.Popen:
+    """Serve main:app with uvicorn on port, with env added to the environment"""
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--no-access-log"],
+        env=dict(os.environ, **env),
+    )
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0, interval: float = 0.2):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(interval)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+@contextmanager
+def timer():
+    """Yield a dict whose 'seconds' key is filled in when the block exits"""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def seed_catalog(db, banks, products_per_bank):
+    """Bulk insert banks and products with long text columns filled in"""
+    import models
+
+    db.execute(insert(models.Bank), [
+        {
+            "name": f"Bench Bank {i}",
+            "description": f"Benchmark bank number {i}",
+            "website": f"https://bank{i}.example.com",
+            "contact_number": f"16{i:03d}",
+            "email": f"info@bank{i}.example.com",
+            "is_active": True,
+        }
+        for i in range(banks)
+    ])
+    bank_ids = [row[0] for row in db.query(models.Bank.id).order_by(models.Bank.id)]
+
+    rows = []
+    for bank_id in bank_ids:
+        for j in range(products_per_bank):
+            months = (6, 12, 18, 24, 36, 60)[j % 6]
+            rows.append({
+                "bank_id": bank_id,
+                "name": f"Product {bank_id}-{j}",
+                "type": "Fixed Deposit" if j % 2 else "DPS",
+                "interest_rate": 5.0 + (j % 30) / 10,
+                "min_deposit": 1000.0 * (1 + j % 50),
+                "max_deposit": 10000000.0,
+                "tenure": f"{months} months",
+                "tenure_months": months,
+                "product_overview": "Overview text " * 20,
+                "key_features": "Feature one|Feature two|Feature three|Feature four",
+                "withdrawal_rules": "Withdrawal rules text " * 10,
+                "eligibility_criteria": "Minimum age 18 years|Valid NID card",
+                "required_documents": "National ID Card (NID)|Recent Passport Size Photo",
+                "compounding_frequency": ("Monthly", "Quarterly", "Yearly")[j % 3],
+                "premature_withdrawal_penalty": "1% of interest",
+                "is_active": True,
+            })
+    for start in range(0, len(rows), 5000):
+        db.execute(insert(models.Product), rows[start:start + 5000])
+    db.commit()
+    return bank_ids
+
+
+def seed_applications(db, product_ids, count):
+    """Bulk insert applications spread over the last 90 days and all statuses"""
+    from datetime import datetime, timedelta
+
+    import models
+
+    now = datetime.now()
+    rows = [
+        {
+            "product_id": product_ids[i % len(product_ids)],
+            "applicant_name": f"Bench Applicant {i}",
+            "phone": f"017{i:08d}",
+            "email": f"applicant{i}@example.com",
+            "deposit_amount": 10000.0 + i % 1000 * 100,
+            "tenure_selected": "12 months",
+            "tenure_months": 12,
+            "status": ("pending", "approved", "rejected")[i % 3],
+            "created_at": now - timedelta(minutes=i * 90 * 24 * 60 // max(count, 1)),
+        }
+        for i in range(count)
+    ]
+    for start in range(0, len(rows), 5000):
+        db.execute(insert(models.Application), rows[start:start + 5000])
+    db.commit()
@@ -0,0 +1,141 @@
+"""
+EXPLAIN report for the read endpoints.
+
+Seeds a database through the migrations, calls each endpoint in ENDPOINTS
+once, captures the SQL it sends and prints the query plan of every SELECT:
+EXPLAIN (or EXPLAIN ANALYZE with --analyze) on PostgreSQL, EXPLAIN QUERY
+PLAN on SQLite. Use it to check that a filter or sort is served by the
+index meant for it (see migrations.py) rather than a sequential scan. Plans
+depend on table statistics, so seed realistic sizes; the tables are
+ANALYZEd after seeding.
+
+Runs in sync database mode; the SQL, and so the plans, are the same in
+async mode.
+
+Usage (from the Backend directory):
+    python -m benchmarks.explain_plans --database-url postgresql://...
+    python -m benchmarks.explain_plans --analyze --sql
+"""
+
+import argparse
+import os
+
+from sqlalchemy import event
+
+from benchmarks.common import seed_applications, seed_catalog, use_database
+
+# (method, path, JSON body); {bank_id} and {product_id} are filled in
+ENDPOINTS = [
+    ("GET", "/banks", None),
+    ("GET", "/banks/{bank_id}", None),
+    ("GET", "/banks/{bank_id}/products", None),
+    ("GET", "/products", None),
+    ("GET", "/products?type=Fixed Deposit", None),
+    ("GET", "/products?bank_id={bank_id}", None),
+    ("GET", "/products?bank_name=bank 7", None),
+    ("GET", "/products?tenure_months=12&active_only=true&sort=-interest_rate", None),
+    ("GET", "/products?amount=50000&min_rate=7", None),
+    ("GET", "/products?fields=type,interest_rate,min_deposit,tenure,key_features,bank.name", None),
+    ("GET", "/products/{product_id}", None),
+    ("POST", "/products/compare", {"principal": 100000, "tenure_months": 12}),
+    ("GET", "/applications", None),
+    ("GET", "/applications?status_filter=pending", None),
+    ("GET", "/applications?cursor=", None),
+    ("GET", "/applications?cursor=&status_filter=approved", None),
+    ("GET", "/stats/dashboard", None),
+    ("GET", "/admin/export/applications?status_filter=approved", None),
+]
+
+
+class StatementLog:
+    """Collect the statements, with their parameters, sent through an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+def explain(engine, statement, parameters, analyze: bool):
+    """Plan lines for statement on engine's dialect"""
+    if engine.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        conn.rollback()
+    return [row[0] if len(row) == 1 else row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--banks", type=int, default=100)
+    parser.add_argument("--products-per-bank", type=int, default=100)
+    parser.add_argument("--applications", type=int, default=50000)
+    parser.add_argument("--analyze", action="store_true",
+                        help="Run the statements (EXPLAIN ANALYZE, PostgreSQL only)")
+    parser.add_argument("--sql", action="store_true", help="Print statements in full")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed (default: throwaway SQLite file)")
+    args = parser.parse_args()
+
+    use_database(args.database_url)
+    os.environ["DATABASE_MODE"] = "sync"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+    import auth
+    import main as app_module
+    import migrations
+    import models
+    from cache import catalog_cache
+    from database import SessionLocal, engine
+
+    migrations.upgrade()
+    db = SessionLocal()
+    bank_ids = seed_catalog(db, args.banks, args.products_per_bank)
+    product_ids = [row[0] for row in db.query(models.Product.id).order_by(models.Product.id)]
+    seed_applications(db, product_ids, args.applications)
+    db.add(models.Admin(username="explain", password_hash="!"))
+    db.commit()
+    db.execute(text("ANALYZE"))
+    db.commit()
+    db.close()
+
+    client = TestClient(app_module.app, cookies={"access_token": auth.create_access_token({"sub": "explain"})})
+    values = {"bank_id": bank_ids[len(bank_ids) // 2], "product_id": product_ids[len(product_ids) // 2]}
+    print(f"{engine.dialect.name}: {len(bank_ids)} banks, {len(product_ids)} products, "
+          f"{args.applications} applications\n")
+
+    for method, path, body in ENDPOINTS:
+        url = path.format(**values)
+        # Plan the database path, not a cache hit
+        catalog_cache.clear()
+        with StatementLog(engine) as log:
+            response = client.request(method, url, json=body)
+        response.raise_for_status()
+        print(f"{method} {url}")
+        for statement, parameters in log.statements:
+            if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                continue
+            sql = " ".join(statement.split())
+            print(f"  {sql if args.sql or len(sql) <= 160 else sql[:157] + '...'}")
+            for line in explain(engine, statement, parameters, args.analyze):
+                print(f"    {line}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
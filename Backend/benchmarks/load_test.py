@@ -0,0 +1,363 @@
+"""
+Reproducible API load test.
+
+Seeds a database through the migrations at the given scale, boots the app
+with uvicorn and drives it over HTTP with concurrent clients. Each client is
+given one of the SCENARIOS, in proportion to --mix, and runs it in a loop:
+
+- browse: a product listing (one of PRODUCT_QUERIES), a product page, the
+  bank list and a bank, as a visitor of the home page would
+- apply: a product page, then POST /applications
+- review: an admin, logged in once, paging pending applications, approving
+  or rejecting one and checking /stats/dashboard
+
+Requests in the first --warmup seconds are not recorded. Throughput, errors
+and p50/p95/p99 latency, overall and per endpoint, are printed and written
+to a JSON file together with the settings, the data sizes and the git
+commit. Pass an earlier file as --baseline to print the change per
+endpoint. Every client draws its choices from its own generator seeded from
+--seed, so runs with the same arguments send the same request sequences.
+
+SQLite serializes writers; use PostgreSQL for numbers that mean something.
+
+Usage (from the Backend directory):
+    python -m benchmarks.load_test --database-url postgresql://... --clients 100 --duration 60
+    python -m benchmarks.load_test --mix browse=100 --output before.json
+    python -m benchmarks.load_test --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.common import (
+    percentile, seed_applications, seed_catalog, start_server, use_database, wait_until_up,
+)
+
+ADMIN = {"username": "load-test-admin", "password": "load-test-password"}
+HOME_GRID_FIELDS = "type,interest_rate,min_deposit,tenure,key_features,bank.name"
+
+# Listings the browse scenario picks from; {bank_id} is filled in
+PRODUCT_QUERIES = [
+    {"fields": HOME_GRID_FIELDS},
+    {"fields": HOME_GRID_FIELDS, "type": "Fixed Deposit"},
+    {"fields": HOME_GRID_FIELDS, "bank_id": "{bank_id}"},
+    {"tenure_months": 12, "active_only": "true", "sort": "-interest_rate"},
+    {"amount": 50000, "min_rate": 7},
+]
+
+
+class Recorder:
+    """Latencies and errors per endpoint, for requests started after record_after"""
+
+    def __init__(self, client, record_after: float):
+        self.client = client
+        self.record_after = record_after
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs):
+        """Send a request, filed under endpoint; the response, or None on failure"""
+        import httpx
+
+        recorded = time.monotonic() >= self.record_after
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        if recorded:
+            if ok:
+                self.latencies.setdefault(endpoint, []).append(time.perf_counter() - start)
+            else:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        return response if ok else None
+
+
+async def browse(recorder: Recorder, rng: random.Random, data: dict):
+    query = rng.choice(PRODUCT_QUERIES)
+    bank_id = rng.choice(data["bank_ids"])
+    params = {key: str(value).format(bank_id=bank_id) for key, value in query.items()}
+    await recorder.request("GET /products", "GET", "/products", params=params)
+    await recorder.request("GET /products/{id}", "GET", f"/products/{rng.choice(data['product_ids'])}")
+    await recorder.request("GET /banks", "GET", "/banks", params={"fields": "name"})
+    await recorder.request("GET /banks/{id}", "GET", f"/banks/{bank_id}")
+
+
+async def apply(recorder: Recorder, rng: random.Random, data: dict):
+    product_id = rng.choice(data["product_ids"])
+    await recorder.request("GET /products/{id}", "GET", f"/products/{product_id}")
+    await recorder.request("POST /applications", "POST", "/applications", json={
+        "product_id": product_id,
+        "applicant_name": "Load Test",
+        "phone": "01700000000",
+        "email": "load-test@example.com",
+        "deposit_amount": rng.choice((10000, 50000, 100000, 500000)),
+        "tenure_selected": "12 months",
+    })
+
+
+async def review(recorder: Recorder, rng: random.Random, data: dict):
+    params = {"cursor": "", "status_filter": "pending", "limit": 20}
+    page = await recorder.request("GET /applications", "GET", "/applications", params=params)
+    if page is not None:
+        body = page.json()
+        if body["next_cursor"] and rng.random() < 0.5:
+            params["cursor"] = body["next_cursor"]
+            page = await recorder.request("GET /applications", "GET", "/applications", params=params)
+            body = page.json() if page is not None else body
+        if body["items"]:
+            application = rng.choice(body["items"])
+            await recorder.request(
+                "PUT /applications/{id}", "PUT", f"/applications/{application['id']}",
+                json={"status": rng.choice(("approved", "rejected"))},
+            )
+    await recorder.request("GET /stats/dashboard", "GET", "/stats/dashboard")
+
+
+SCENARIOS = {"browse": browse, "apply": apply, "review": review}
+
+
+def parse_mix(raw: str) -> Dict[str, int]:
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"expected scenario=weight with scenarios {', '.join(SCENARIOS)}")
+        mix[name] = int(weight)
+    if not sum(mix.values()):
+        raise argparse.ArgumentTypeError("the weights add up to zero")
+    return mix
+
+
+def assign(clients: int, mix: Dict[str, int]) -> List[str]:
+    """Scenario of each client, spread over the clients in proportion to mix"""
+    total = sum(mix.values())
+    scenarios = []
+    for i in range(clients):
+        position = (i + 0.5) / clients * total
+        for name, weight in mix.items():
+            if position < weight:
+                scenarios.append(name)
+                break
+            position -= weight
+    return scenarios
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / seconds, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def run_load(base_url: str, scenarios: List[str], warmup: float, duration: float,
+                   seed: int, data: dict) -> dict:
+    import httpx
+
+    record_after = time.monotonic() + warmup
+    deadline = record_after + duration
+    limits = httpx.Limits(max_connections=len(scenarios), max_keepalive_connections=len(scenarios))
+
+    async def one_client(index: int, scenario: str, shared, recorders: List[Recorder]):
+        rng = random.Random(seed * 100003 + index)
+        if scenario == "review":
+            # Admins keep their own cookie jar
+            client = httpx.AsyncClient(base_url=base_url, timeout=60)
+            response = await client.post("/auth/login", json=ADMIN)
+            response.raise_for_status()
+        else:
+            client = shared
+        recorder = Recorder(client, record_after)
+        recorders.append(recorder)
+        try:
+            while time.monotonic() < deadline:
+                await SCENARIOS[scenario](recorder, rng, data)
+        finally:
+            if client is not shared:
+                await client.aclose()
+
+    recorders: List[Recorder] = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as shared:
+        await asyncio.gather(*(
+            one_client(index, scenario, shared, recorders) for index, scenario in enumerate(scenarios)
+        ))
+    seconds = max(time.monotonic(), deadline) - record_after
+
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for recorder in recorders:
+        for endpoint, values in recorder.latencies.items():
+            latencies.setdefault(endpoint, []).extend(values)
+        for endpoint, count in recorder.errors.items():
+            errors[endpoint] = errors.get(endpoint, 0) + count
+    endpoints = sorted(set(latencies) | set(errors))
+    return {
+        "seconds": round(seconds, 2),
+        "overall": summarize(
+            [value for values in latencies.values() for value in values], sum(errors.values()), seconds
+        ),
+        "endpoints": {
+            endpoint: summarize(latencies.get(endpoint, []), errors.get(endpoint, 0), seconds)
+            for endpoint in endpoints
+        },
+    }
+
+
+def prepare_database(args) -> dict:
+    """Migrate and, unless it already holds banks, seed the database; its ids and sizes"""
+    import auth
+    import migrations
+    import models
+    from database import SessionLocal, engine
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    try:
+        if not db.query(models.Bank.id).first():
+            seed_catalog(db, args.banks, args.products_per_bank)
+            product_ids = [row[0] for row in db.query(models.Product.id).order_by(models.Product.id)]
+            seed_applications(db, product_ids, args.applications)
+        if not db.query(models.Admin.id).filter(models.Admin.username == ADMIN["username"]).first():
+            db.add(models.Admin(username=ADMIN["username"],
+                                password_hash=auth.get_password_hash(ADMIN["password"])))
+            db.commit()
+        data = {
+            "dialect": engine.dialect.name,
+            "bank_ids": [row[0] for row in db.query(models.Bank.id).order_by(models.Bank.id)],
+            "product_ids": [row[0] for row in db.query(models.Product.id).order_by(models.Product.id)],
+            "applications": db.query(models.Application.id).count(),
+        }
+    finally:
+        db.close()
+    engine.dispose()
+    return data
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(result: dict):
+    print(f"  {'endpoint':<24} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    rows = list(result["endpoints"].items()) + [("overall", result["overall"])]
+    for endpoint, stats in rows:
+        print(f"  {endpoint:<24} {stats['throughput']:8.1f} {stats['p50_ms']:8.1f} "
+              f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f} {stats['errors']:7d}")
+
+
+def print_comparison(result: dict, baseline: dict):
+    def change(new, old):
+        return f"{(new - old) / old * 100:+7.1f}%" if old else "      -"
+
+    print(f"\nChange from baseline ({baseline.get('git_commit') or 'unknown commit'}, "
+          f"{baseline['started_at']})")
+    print(f"  {'endpoint':<24} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = list(result["endpoints"].items()) + [("overall", result["overall"])]
+    for endpoint, stats in rows:
+        old = baseline["overall"] if endpoint == "overall" else baseline["endpoints"].get(endpoint)
+        if old is None:
+            continue
+        print(f"  {endpoint:<24} {change(stats['throughput'], old['throughput'])} "
+              + " ".join(change(stats[key], old[key]) for key in ("p50_ms", "p95_ms", "p99_ms")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed and serve (default: throwaway SQLite file); "
+                             "one that already holds banks is used as is")
+    parser.add_argument("--banks", type=int, default=50)
+    parser.add_argument("--products-per-bank", type=int, default=20)
+    parser.add_argument("--applications", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("browse=70,apply=20,review=10"),
+                        help="Scenario weights (default: browse=70,apply=20,review=10)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds before recording starts")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds recorded")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync", help="DATABASE_MODE to serve with")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--no-cache", action="store_true", help="Turn the catalog cache off")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", default=None,
+                        help="JSON results file (default: load-test-<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    database_url = use_database(args.database_url)
+    data = prepare_database(args)
+    scenarios = assign(args.clients, args.mix)
+    env = {"DATABASE_URL": database_url, "DATABASE_MODE": args.mode}
+    if args.no_cache:
+        env["CATALOG_CACHE_MAX_ENTRIES"] = "0"
+
+    started_at = datetime.now(timezone.utc)
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"{args.clients} clients ({', '.join(f'{scenarios.count(name)} {name}' for name in args.mix)}), "
+          f"{args.duration:.0f}s after {args.warmup:.0f}s warmup, {data['dialect']} {args.mode} mode, "
+          f"{len(data['bank_ids'])} banks / {len(data['product_ids'])} products / "
+          f"{data['applications']} applications")
+    server = start_server(args.port, env, args.workers)
+    try:
+        asyncio.run(wait_until_up(base_url))
+        result = asyncio.run(run_load(base_url, scenarios, args.warmup, args.duration, args.seed, data))
+    finally:
+        server.terminate()
+        server.wait()
+    print_results(result)
+
+    report = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "settings": {
+            "database": data["dialect"],
+            "mode": args.mode,
+            "workers": args.workers,
+            "catalog_cache": not args.no_cache,
+            "clients": args.clients,
+            "mix": args.mix,
+            "warmup": args.warmup,
+            "duration": args.duration,
+            "seed": args.seed,
+        },
+        "data": {
+            "banks": len(data["bank_ids"]),
+            "products": len(data["product_ids"]),
+            "applications": data["applications"],
+        },
+        **result,
+    }
+    output = args.output or f"load-test-{started_at:%Y%m%d-%H%M%S}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            print_comparison(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
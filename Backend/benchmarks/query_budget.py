@@ -0,0 +1,68 @@
+"""
+Query budget check for the read endpoints.
+
+Seeds a throwaway database, calls each endpoint once and fails (exit code 1)
+if any of them sends more SQL statements than its budget. The budgets do not
+depend on how many rows come back, so an N+1 regression shows up immediately.
+
+Usage (from the Backend directory):
+    python -m benchmarks.query_budget
+    python -m benchmarks.query_budget --banks 200 --products-per-bank 10
+"""
+
+import argparse
+import sys
+
+from benchmarks.common import StatementCounter, create_schema, seed_catalog, use_database
+
+# Maximum number of SQL statements per request
+BUDGETS = {
+    "/banks": 2,
+    "/banks/{bank_id}": 1,
+    "/products": 1,
+    "/products/{product_id}": 1,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--banks", type=int, default=50)
+    parser.add_argument("--products-per-bank", type=int, default=5)
+    args = parser.parse_args()
+
+    use_database()
+    create_schema()
+    from fastapi.testclient import TestClient
+    import main as app_module
+    from cache import catalog_cache
+    from database import SessionLocal, async_engine, engine
+
+    db = SessionLocal()
+    bank_ids = seed_catalog(db, args.banks, args.products_per_bank)
+    db.close()
+
+    client = TestClient(app_module.app)
+    paths = {
+        "/banks": f"/banks?limit={args.banks}",
+        "/banks/{bank_id}": f"/banks/{bank_ids[0]}",
+        "/products": f"/products?limit={args.banks * args.products_per_bank}",
+        "/products/{product_id}": "/products/1",
+    }
+
+    failed = False
+    for route, budget in BUDGETS.items():
+        # Measure the database path, not a cache hit
+        catalog_cache.clear()
+        with StatementCounter(async_engine.sync_engine if async_engine else engine) as counter:
+            response = client.get(paths[route])
+        response.raise_for_status()
+        ok = counter.count <= budget
+        failed = failed or not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {route:<24} {counter.count} statements (budget {budget})")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Startup benchmark: time to first request, with and without WARMUP.
+
+For each setting, starts uvicorn --repeat times and measures:
+- ready: from spawning the process until GET /api answers
+- the latency of the first request to each of PROBES after that, and of
+  the second one, which shows what the first request still pays for
+
+Also reports how long `import main` takes on its own; it opens no database
+connections, so it is the same whether or not the database is reachable.
+
+Usage (from the Backend directory):
+    python -m benchmarks.startup_time --database-url postgresql://... --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import create_schema, seed_catalog, start_server, use_database, wait_until_up
+
+PROBES = [
+    "/products?active_only=true&fields=type,interest_rate,min_deposit,tenure,key_features,bank.name",
+    "/banks",
+    "/products/1",
+]
+
+
+def import_seconds(env: dict) -> float:
+    code = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+async def first_requests(base_url: str):
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        timings = {}
+        for path in PROBES:
+            samples = []
+            for _ in range(2):
+                start = time.perf_counter()
+                (await client.get(path)).raise_for_status()
+                samples.append(time.perf_counter() - start)
+            timings[path] = samples
+        return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed and serve (default: throwaway SQLite file)")
+    parser.add_argument("--banks", type=int, default=50)
+    parser.add_argument("--products-per-bank", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    database_url = use_database(args.database_url)
+    create_schema()
+    import models
+    from database import SessionLocal, engine
+
+    db = SessionLocal()
+    if not db.query(models.Bank.id).first():
+        seed_catalog(db, args.banks, args.products_per_bank)
+    db.close()
+    engine.dispose()
+
+    env = {"DATABASE_URL": database_url, "DATABASE_MODE": args.mode}
+    imports = [import_seconds(dict(os.environ, **env)) for _ in range(args.repeat)]
+    print(f"import main: {statistics.median(imports) * 1000:.0f} ms (median of {args.repeat})\n")
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"median of {args.repeat} starts, {args.mode} mode; first / second request in ms")
+    for warm in (False, True):
+        ready, firsts, seconds = [], {path: [] for path in PROBES}, {path: [] for path in PROBES}
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            server = start_server(args.port, dict(env, WARMUP=str(warm).lower()))
+            try:
+                asyncio.run(wait_until_up(base_url, interval=0.01))
+                ready.append(time.perf_counter() - start)
+                for path, (first, second) in asyncio.run(first_requests(base_url)).items():
+                    firsts[path].append(first)
+                    seconds[path].append(second)
+            finally:
+                server.terminate()
+                server.wait()
+        print(f"  WARMUP={str(warm).lower():<5} ready {statistics.median(ready) * 1000:6.0f} ms")
+        for path in PROBES:
+            label = path if len(path) <= 40 else path[:37] + "..."
+            print(f"    {label:<40} {statistics.median(firsts[path]) * 1000:7.1f} "
+                  f"/ {statistics.median(seconds[path]) * 1000:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Product CSV import and export for /admin/import/products and
+/admin/export/products.
+
+The CSV columns are `id` followed by the fields of schemas.ProductCreate,
+so an export can be edited and imported back. On import, a row with an id
+updates that product; a row without one updates the product with the same
+(bank_id, name) if there is one and is inserted otherwise. An update writes
+only the cells the row fills in, so a file with just some of the columns,
+or a blank cell, leaves the other fields as they are (a field cannot be
+cleared through the import); new products get the defaults. Rows are
+validated and written CHUNK_ROWS at a time, so neither direction holds the
+whole file or table in memory. Rows are read in strict mode, so a file
+that is not valid CSV (an unclosed or stray quote, an oversized field) is
+rejected as a whole with a 400 naming the line, since the rows after it
+cannot be told apart reliably.
+"""
+
+import csv
+import os
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+from streaming import TextChunks
+from tenure import parse_tenure_months
+
+FIELDS = list(schemas.ProductCreate.model_fields)
+COLUMNS = ["id", *FIELDS]
+REQUIRED = {name for name, field in schemas.ProductCreate.model_fields.items() if field.is_required()}
+
+CHUNK_ROWS = int(os.getenv("PRODUCT_CSV_CHUNK_ROWS", "1000"))
+# Rejected rows listed in the import report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+def export_products(db: Session, chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """Yield the products table as CSV text, chunk_rows rows at a time
+
+    yield_per streams the result (a server-side cursor on PostgreSQL)
+    instead of fetching every row up front.
+    """
+    out = TextChunks()
+    writer = csv.writer(out)
+    writer.writerow(COLUMNS)
+    yield out.drain()
+
+    result = db.execute(
+        select(*(getattr(models.Product, name) for name in COLUMNS))
+        .order_by(models.Product.id)
+        .execution_options(yield_per=chunk_rows)
+    )
+    for rows in result.partitions():
+        writer.writerows(rows)
+        yield out.drain()
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        # For cache invalidation once the import is committed
+        self.bank_ids: Set[int] = set()
+        self.product_ids: Set[int] = set()
+
+    def reject(self, line: int, detail: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    def result(self) -> dict:
+        return {"created": self.created, "updated": self.updated, "failed": self.failed, "errors": self.errors}
+
+
+def import_products(db: Session, lines: Iterable[str], chunk_rows: int = CHUNK_ROWS) -> ImportReport:
+    """Validate and upsert products from CSV lines in the caller's transaction"""
+    reader = csv.DictReader(lines, strict=True)
+    report = ImportReport()
+    known_banks: Set[int] = set()
+    chunk: List[Tuple[int, dict]] = []
+    # Line the row being read starts on; an unclosed quote only fails at the end of the file
+    start = 1
+    try:
+        missing = REQUIRED - set(reader.fieldnames or ())
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Missing CSV columns: {', '.join(sorted(missing))}")
+        start = reader.line_num + 1
+        for row in reader:
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= chunk_rows:
+                _import_chunk(db, chunk, known_banks, report)
+                chunk = []
+            start = reader.line_num + 1
+    except csv.Error as error:
+        # Nothing is committed: the caller's transaction is rolled back
+        raise HTTPException(status_code=400, detail=f"Malformed CSV at line {start}: {error}")
+    if chunk:
+        _import_chunk(db, chunk, known_banks, report)
+    return report
+
+
+def _validate(line: int, row: dict, rejected: List[Tuple[int, str]]):
+    """Return (id or None, ProductCreate) for a CSV row, or None if it is rejected"""
+    # Empty cells fall back to the schema defaults
+    data = {name: row[name] for name in FIELDS if row.get(name) not in (None, "")}
+    try:
+        product = schemas.ProductCreate.model_validate(data)
+    except ValidationError as error:
+        rejected.append((line, "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+        )))
+        return None
+    raw_id = (row.get("id") or "").strip()
+    if not raw_id:
+        return None, product
+    try:
+        return int(raw_id), product
+    except ValueError:
+        rejected.append((line, "id: Input should be a valid integer"))
+        return None
+
+
+def _import_chunk(db: Session, chunk: List[Tuple[int, dict]], known_banks: Set[int], report: ImportReport):
+    valid = []
+    # Rejections are collected and reported in line order once the chunk is checked
+    rejected: List[Tuple[int, str]] = []
+    for line, row in chunk:
+        parsed = _validate(line, row, rejected)
+        if parsed is not None:
+            valid.append((line, *parsed))
+
+    # One query for the banks this chunk introduces
+    new_banks = {product.bank_id for _, _, product in valid} - known_banks
+    if new_banks:
+        known_banks.update(row[0] for row in db.query(models.Bank.id).filter(models.Bank.id.in_(new_banks)))
+
+    # One query each for existing products matched by id and by (bank_id, name)
+    ids = {product_id for _, product_id, _ in valid if product_id is not None}
+    by_id = dict(
+        db.query(models.Product.id, models.Product.bank_id).filter(models.Product.id.in_(ids))
+    ) if ids else {}
+    keys = {(product.bank_id, product.name) for _, product_id, product in valid if product_id is None}
+    by_key: Dict[Tuple[int, str], int] = {}
+    if keys:
+        matches = (
+            db.query(models.Product.id, models.Product.bank_id, models.Product.name)
+            .filter(tuple_(models.Product.bank_id, models.Product.name).in_(keys))
+            .order_by(models.Product.id)
+        )
+        for product_id, bank_id, name in matches:
+            by_key.setdefault((bank_id, name), product_id)
+
+    updates: Dict[int, dict] = {}
+    inserts: Dict[Tuple[int, str], dict] = {}
+    # Bulk statements bypass the @validates hook, so parse each distinct tenure here
+    tenure_months: Dict[str, int] = {}
+    for line, product_id, product in valid:
+        if product.bank_id not in known_banks:
+            rejected.append((line, "Bank not found"))
+            continue
+        if product_id is not None and product_id not in by_id:
+            rejected.append((line, "Product not found"))
+            continue
+
+        # Updates write only the cells the file fills in; inserts get the defaults too
+        values = product.model_dump(exclude_unset=True)
+        if product.tenure not in tenure_months:
+            tenure_months[product.tenure] = parse_tenure_months(product.tenure)
+        values["tenure_months"] = tenure_months[product.tenure]
+        report.bank_ids.add(product.bank_id)
+
+        key = (product.bank_id, product.name)
+        if product_id is None:
+            product_id = by_key.get(key)
+        else:
+            # The product may be moving away from its current bank
+            report.bank_ids.add(by_id[product_id])
+        if product_id is not None:
+            report.product_ids.add(product_id)
+            # Later rows for the same product update it further
+            updates.setdefault(product_id, {"id": product_id}).update(values)
+        else:
+            # A later row for the same new product wins
+            inserts[key] = {**product.model_dump(), "tenure_months": values["tenure_months"]}
+
+    for line, detail in sorted(rejected):
+        report.reject(line, detail)
+    report.updated += len(updates)
+    report.created += len(inserts)
+    # One executemany per set of columns written
+    batches: Dict[Tuple[str, ...], List[dict]] = {}
+    for values in updates.values():
+        batches.setdefault(tuple(sorted(values)), []).append(values)
+    for batch in batches.values():
+        db.execute(update(models.Product), batch)
+    if inserts:
+        db.execute(insert(models.Product), list(inserts.values()))
@@ -0,0 +1,120 @@
+"""
+Fast JSON for the catalog list endpoints (GET /products, GET /banks and
+GET /banks/{bank_id}/products).
+
+Rather than loading ORM objects, validating them into the response schemas
+and dumping those, the list queries select plain columns and the rows are
+written straight to JSON with orjson. Keys follow the schema field order,
+so the output is the same as response_model would produce;
+benchmarks/bench_json.py checks that and measures the difference.
+
+GET /products and GET /banks also take a fields= parameter (see
+parse_fields); only the columns of the requested fields are selected, so
+the large Text columns are neither read nor sent unless asked for.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import HTTPException
+
+import models
+import schemas
+
+PRODUCT_FIELDS = list(schemas.Product.model_fields)
+BANK_FIELDS = list(schemas.Bank.model_fields)
+
+# pydantic writes a zero UTC offset as "Z"
+OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(data) -> bytes:
+    return orjson.dumps(data, option=OPTIONS)
+
+
+def product_columns(fields: List[str] = PRODUCT_FIELDS) -> list:
+    return [getattr(models.Product, name) for name in fields]
+
+
+def bank_columns(fields: List[str] = BANK_FIELDS) -> list:
+    return [getattr(models.Bank, name) for name in fields]
+
+
+PRODUCT_COLUMNS = product_columns()
+BANK_COLUMNS = bank_columns()
+
+
+def parse_fields(raw: Optional[str], fields: List[str], nested: str,
+                 nested_fields: List[str]) -> Tuple[List[str], Optional[List[str]]]:
+    """Resolve a fields= parameter to (fields, nested fields)
+
+    raw is a comma-separated list of field names. `nested` (bank or
+    products) asks for the whole nested object and `nested.<name>` for
+    single fields of it; id is always included. Without the parameter every
+    field is returned. The nested fields are None when it is not requested.
+    """
+    if raw is None:
+        return fields, nested_fields
+    top, sub = {"id"}, set()
+    whole = False
+    for name in filter(None, (part.strip() for part in raw.split(","))):
+        if name == nested:
+            whole = True
+        elif name.startswith(nested + ".") and name[len(nested) + 1:] in nested_fields:
+            sub.add(name[len(nested) + 1:])
+        elif name in fields:
+            top.add(name)
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+    selected = [name for name in fields if name in top]
+    if whole:
+        return selected, nested_fields
+    if sub:
+        sub.add("id")
+        return selected, [name for name in nested_fields if name in sub]
+    return selected, None
+
+
+def products(rows: Iterable[Sequence], fields: List[str] = PRODUCT_FIELDS) -> bytes:
+    """List[schemas.Product] from rows of product_columns(fields)"""
+    return dumps([dict(zip(fields, row)) for row in rows])
+
+
+def products_with_bank(rows: Iterable[Sequence], fields: List[str] = PRODUCT_FIELDS,
+                       bank_fields: Optional[List[str]] = BANK_FIELDS) -> bytes:
+    """List[schemas.ProductWithBank] from rows of product_columns(fields)
+    followed by bank_columns(bank_fields) (none if bank_fields is None)"""
+    if bank_fields is None:
+        return products(rows, fields)
+    split = len(fields)
+    banks: Dict[tuple, dict] = {}
+    items = []
+    for row in rows:
+        product = dict(zip(fields, row[:split]))
+        bank_row = tuple(row[split:])
+        bank = banks.get(bank_row)
+        if bank is None:
+            bank = banks[bank_row] = dict(zip(bank_fields, bank_row))
+        product["bank"] = bank
+        items.append(product)
+    return dumps(items)
+
+
+def banks_with_products(bank_rows: Iterable[Sequence], product_rows: Iterable[Sequence],
+                        fields: List[str] = BANK_FIELDS,
+                        product_fields: Optional[List[str]] = PRODUCT_FIELDS) -> bytes:
+    """List[schemas.BankWithProducts] from rows of bank_columns(fields) and
+    of (Product.bank_id, *product_columns(product_fields)) for those banks
+
+    With product_fields None, product_rows is ignored and no products key
+    is written.
+    """
+    items = [dict(zip(fields, row)) for row in bank_rows]
+    if product_fields is None:
+        return dumps(items)
+    by_bank: Dict[int, List[dict]] = {}
+    for bank in items:
+        bank["products"] = by_bank[bank["id"]] = []
+    for bank_id, *values in product_rows:
+        by_bank[bank_id].append(dict(zip(product_fields, values)))
+    return dumps(items)
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+
+# Compounding periods per year, keyed by normalized compounding_frequency.
+# Products with no (or an unknown) frequency earn simple interest.
+PERIODS_PER_YEAR = {
+    "daily": 365,
+    "monthly": 12,
+    "quarterly": 4,
+    "half-yearly": 2,
+    "half yearly": 2,
+    "semi-annually": 2,
+    "semi-annual": 2,
+    "yearly": 1,
+    "annually": 1,
+    "annual": 1,
+}
+
+# Safety net for writes made by other processes; writes through this process
+# call invalidate() directly
+SNAPSHOT_TTL_SECONDS = float(os.getenv("COMPARE_SNAPSHOT_TTL_SECONDS", "60"))
+
+
+def periods_per_year(frequencies) -> np.ndarray:
+    """Map compounding_frequency strings to periods per year (0 = simple interest)"""
+    lookup = {}
+    periods = np.empty(len(frequencies), dtype=np.float64)
+    for i, frequency in enumerate(frequencies):
+        if frequency not in lookup:
+            lookup[frequency] = PERIODS_PER_YEAR.get((frequency or "").strip().lower(), 0)
+        periods[i] = lookup[frequency]
+    return periods
+
+
+def maturity(principal: float, rates, periods, months):
+    """Maturity amounts and effective annual yields for a batch of products
+
+    rates are nominal annual percentages, periods come from periods_per_year
+    and months is the tenure of each product. Returns two float64 arrays.
+    """
+    r = np.asarray(rates, dtype=np.float64) / 100.0
+    n = np.asarray(periods, dtype=np.float64)
+    years = np.asarray(months, dtype=np.float64) / 12.0
+
+    compound = n > 0
+    safe_n = np.where(compound, n, 1.0)
+    per_period = 1.0 + r / safe_n
+
+    amount = np.where(
+        compound,
+        principal * np.power(per_period, safe_n * years),
+        principal * (1.0 + r * years)
+    )
+    annual_yield = np.where(compound, np.power(per_period, safe_n) - 1.0, r)
+    return amount, annual_yield
+
+
+def rank(amount, annual_yield) -> np.ndarray:
+    """Indices ordering products by maturity amount, then yield, both descending"""
+    return np.lexsort((-annual_yield, -amount))
+
+
+class ProductMatrix:
+    """Columnar snapshot of the active catalog for vectorized comparison"""
+
+    def __init__(self, rows):
+        (ids, bank_ids, bank_names, names, types, rates,
+         frequencies, months, min_deposits, max_deposits) = zip(*rows) if rows else ((),) * 10
+        self.ids = np.array(ids, dtype=np.int64)
+        self.bank_ids = np.array(bank_ids, dtype=np.int64)
+        self.bank_names = bank_names
+        self.names = names
+        self.types = np.array(types, dtype=object)
+        self.rates = np.array(rates, dtype=np.float64)
+        self.frequencies = frequencies
+        self.periods = periods_per_year(frequencies)
+        self.months = np.array(months, dtype=np.int64)
+        self.min_deposits = np.array(min_deposits, dtype=np.float64)
+        self.max_deposits = np.array(
+            [np.inf if value is None else value for value in max_deposits], dtype=np.float64
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def match(self, principal: float, tenure_months: Optional[int] = None,
+              type: Optional[str] = None) -> np.ndarray:
+        """Indices of products that accept principal and have the tenure/type"""
+        mask = (self.min_deposits <= principal) & (self.max_deposits >= principal)
+        if tenure_months is not None:
+            mask &= self.months == tenure_months
+        if type:
+            mask &= self.types == type
+        return np.flatnonzero(mask)
+
+
+def load_matrix(db: Session) -> ProductMatrix:
+    """Read the active products with a known tenure into a ProductMatrix"""
+    rows = db.execute(
+        select(
+            models.Product.id,
+            models.Product.bank_id,
+            models.Bank.name,
+            models.Product.name,
+            models.Product.type,
+            models.Product.interest_rate,
+            models.Product.compounding_frequency,
+            models.Product.tenure_months,
+            models.Product.min_deposit,
+            models.Product.max_deposit,
+        )
+        .join(models.Product.bank)
+        .where(
+            models.Product.is_active.is_(True),
+            models.Bank.is_active.is_(True),
+            models.Product.tenure_months.isnot(None),
+        )
+    ).all()
+    return ProductMatrix(rows)
+
+
+_matrix: Optional[ProductMatrix] = None
+_loaded_at = 0.0
+_generation = 0
+_lock = threading.Lock()
+
+
+def get_matrix(db: Session) -> ProductMatrix:
+    """Return the cached snapshot, reloading it when stale or invalidated"""
+    global _matrix, _loaded_at
+    with _lock:
+        if _matrix is not None and time.monotonic() - _loaded_at <= SNAPSHOT_TTL_SECONDS:
+            return _matrix
+        generation = _generation
+    # Load without holding the lock: in async mode this runs on the event
+    # loop, where waiting on a lock held across a query would stall it
+    matrix = load_matrix(db)
+    with _lock:
+        if generation == _generation:
+            _matrix = matrix
+            _loaded_at = time.monotonic()
+    return matrix
+
+
+def invalidate():
+    """Drop the snapshot; call after any bank or product write"""
+    global _matrix, _generation
+    with _lock:
+        _matrix = None
+        _generation += 1
@@ -0,0 +1,253 @@
+"""
+Dashboard statistics for GET /stats/dashboard.
+
+Two modes, chosen with DASHBOARD_STATS_MODE:
+- "aggregate" (default): one query with conditional counts
+- "summary": read counters from the dashboard_counters table, which the write
+  endpoints keep up to date inside their own transactions, so the dashboard
+  costs the same regardless of table size
+
+To rebuild the counters from the tables (e.g. after bulk loads that bypass
+the API):
+    python dashboard.py
+"""
+
+import os
+from collections import Counter
+from datetime import datetime, time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, select, text, update
+from sqlalchemy.orm import Session
+
+import models
+
+SUMMARY_MODE = os.getenv("DASHBOARD_STATS_MODE", "aggregate").lower() == "summary"
+
+TOTAL_BANKS = "total_banks"
+TOTAL_PRODUCTS = "total_products"
+PENDING = "pending_applications"
+
+
+def approved_key(day) -> str:
+    return f"approved:{day.isoformat()}"
+
+
+def _today_start() -> datetime:
+    return datetime.combine(datetime.now().date(), time.min)
+
+
+def _local_date(value: datetime):
+    # Values read back from the database are timezone-aware, values set by
+    # the endpoints are naive local time
+    return value.astimezone().date() if value.tzinfo else value.date()
+
+
+def _application_counts():
+    """COUNT(CASE ...) columns for pending and approved-today applications"""
+    return (
+        func.count(case((models.Application.status == "pending", 1))),
+        func.count(case((and_(
+            models.Application.status == "approved",
+            models.Application.reviewed_at >= _today_start()
+        ), 1))),
+    )
+
+
+def application_counts(db: Session, *criteria) -> Dict[str, int]:
+    """Pending and approved-today counts over applications matching criteria"""
+    pending, approved_today = db.query(*_application_counts()).filter(*criteria).one()
+    return {"pending_applications": pending, "approved_today": approved_today}
+
+
+def aggregate_stats(db: Session) -> Dict[str, int]:
+    """All dashboard numbers in a single statement"""
+    total_banks = select(func.count()).select_from(models.Bank).scalar_subquery()
+    total_products = select(func.count()).select_from(models.Product).scalar_subquery()
+    row = db.query(
+        total_banks, total_products, *_application_counts()
+    ).select_from(models.Application).one()
+    return {
+        "total_banks": row[0],
+        "total_products": row[1],
+        "pending_applications": row[2],
+        "approved_today": row[3],
+    }
+
+
+def summary_stats(db: Session) -> Dict[str, int]:
+    """Dashboard numbers from the counters table (built on first use)"""
+    today = approved_key(datetime.now().date())
+    keys = [TOTAL_BANKS, TOTAL_PRODUCTS, PENDING, today]
+    values = dict(db.query(models.DashboardCounter.key, models.DashboardCounter.value)
+                  .filter(models.DashboardCounter.key.in_(keys)).all())
+    if TOTAL_BANKS not in values:
+        stats = rebuild(db)
+        db.commit()
+        return stats
+    return {
+        "total_banks": values.get(TOTAL_BANKS, 0),
+        "total_products": values.get(TOTAL_PRODUCTS, 0),
+        "pending_applications": values.get(PENDING, 0),
+        "approved_today": values.get(today, 0),
+    }
+
+
+def application_keys(status: Optional[str], reviewed_at: Optional[datetime]) -> List[str]:
+    """Counter keys an application with this status/review time contributes to"""
+    if status == "pending":
+        return [PENDING]
+    if status == "approved" and reviewed_at is not None:
+        return [approved_key(_local_date(reviewed_at))]
+    return []
+
+
+def record(db: Session, deltas: Dict[str, int]):
+    """Apply counter deltas in the caller's transaction (summary mode only)"""
+    if not SUMMARY_MODE:
+        return
+    table = models.DashboardCounter.__table__
+    # Fixed key order so concurrent writers lock rows in the same order
+    for key in sorted(k for k, v in deltas.items() if v):
+        delta = deltas[key]
+        updated = db.execute(
+            update(table).where(table.c.key == key).values(value=table.c.value + delta)
+        ).rowcount
+        # Daily keys start fresh each day; the fixed keys only exist once
+        # rebuild() has run, and until then it recomputes them anyway
+        if not updated and key.startswith("approved:"):
+            _insert_counter(db, key, delta)
+
+
+def record_transition(db: Session, before: Iterable[str], after: Iterable[str]):
+    """Move an application's contribution from the before keys to the after keys"""
+    deltas = Counter(after)
+    deltas.subtract(Counter(before))
+    record(db, deltas)
+
+
+def record_bulk_transition(db: Session, before: Iterable[Tuple[Optional[str], Optional[datetime]]],
+                           status: Optional[str], reviewed_at: Optional[datetime]):
+    """Move applications from their (status, reviewed_at) pairs in before to
+    status/reviewed_at, one pair per updated row"""
+    if not SUMMARY_MODE:
+        return
+    after = application_keys(status, reviewed_at)
+    deltas = Counter()
+    for old_status, old_reviewed_at in before:
+        deltas.subtract(application_keys(old_status, old_reviewed_at))
+        deltas.update(after)
+    record(db, deltas)
+
+
+def update_applications(db: Session, criteria: list, values: dict) -> List[models.Application]:
+    """UPDATE the applications matching criteria and return them, moving the
+    summary counters by what each updated row counted for before and after
+
+    On PostgreSQL the UPDATE joins the matching rows as they were, locked FOR
+    UPDATE, and returns their old status and review time with each new row,
+    so the counters move by exactly the rows it changed. SQLite's RETURNING
+    cannot read joined tables; there the old values are read, by id, just
+    before the UPDATE in the same session.
+    """
+    Application = models.Application
+    statement = update(Application).values(**values).execution_options(synchronize_session=False)
+    if not SUMMARY_MODE:
+        return db.execute(statement.where(*criteria).returning(Application)).scalars().all()
+
+    if db.get_bind().dialect.name == "postgresql":
+        old = (
+            select(Application.id, Application.status, Application.reviewed_at)
+            .where(*criteria).with_for_update().subquery("old")
+        )
+        rows = db.execute(
+            statement.where(Application.id == old.c.id)
+            .returning(Application, old.c.status, old.c.reviewed_at)
+        ).all()
+        record_bulk_transition(db, [(row[1], row[2]) for row in rows], values["status"], values["reviewed_at"])
+        return [row[0] for row in rows]
+
+    old_values = {
+        row.id: (row.status, row.reviewed_at)
+        for row in db.execute(select(Application.id, Application.status, Application.reviewed_at).where(*criteria))
+    }
+    applications = db.execute(statement.where(*criteria).returning(Application)).scalars().all()
+    record_bulk_transition(
+        db, [old_values.get(application.id, (None, None)) for application in applications],
+        values["status"], values["reviewed_at"]
+    )
+    return applications
+
+
+def record_removed_applications(db: Session, *criteria):
+    """Decrement counters for applications about to be deleted (including FK cascades)"""
+    if not SUMMARY_MODE:
+        return
+    counts = application_counts(db, *criteria)
+    record(db, {
+        PENDING: -counts["pending_applications"],
+        approved_key(datetime.now().date()): -counts["approved_today"],
+    })
+
+
+def rebuild(db: Session) -> Dict[str, int]:
+    """Recompute every counter from the tables and return the stats
+
+    Writers are held off until the caller commits, so each write is either
+    in the counts or applies its delta to the rebuilt rows afterwards: on
+    PostgreSQL by an EXCLUSIVE lock on the counters table, which their
+    UPDATEs wait for, on SQLite by the write lock its first statement takes.
+    Rows are upserted rather than deleted and re-inserted, so a write never
+    finds its counter missing and two first-use rebuilds do not collide.
+    """
+    table = models.DashboardCounter.__table__
+    today = approved_key(datetime.now().date())
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(f"LOCK TABLE {table.name} IN EXCLUSIVE MODE"))
+    # Approval counters of earlier days are not recomputed; drop them
+    db.execute(delete(table).where(table.c.key.like("approved:%"), table.c.key != today))
+    stats = aggregate_stats(db)
+    for key, value in (
+        (TOTAL_BANKS, stats["total_banks"]),
+        (TOTAL_PRODUCTS, stats["total_products"]),
+        (PENDING, stats["pending_applications"]),
+        (today, stats["approved_today"]),
+    ):
+        _upsert_counter(db, key, value, value)
+    return stats
+
+
+def _insert_counter(db: Session, key: str, delta: int):
+    """Create a missing counter row, tolerating a concurrent insert of the same key"""
+    _upsert_counter(db, key, delta, models.DashboardCounter.__table__.c.value + delta)
+
+
+def _upsert_counter(db: Session, key: str, value: int, on_conflict):
+    """Insert a counter row with value, or set an existing one to on_conflict"""
+    table = models.DashboardCounter.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        if not db.execute(update(table).where(table.c.key == key).values(value=on_conflict)).rowcount:
+            db.execute(table.insert().values(key=key, value=value))
+        return
+    db.execute(
+        insert(table).values(key=key, value=value).on_conflict_do_update(
+            index_elements=[table.c.key], set_={"value": on_conflict}
+        )
+    )
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        rebuild(session)
+        session.commit()
+        print("✓ Dashboard counters rebuilt:", summary_stats(session))
+    finally:
+        session.close()
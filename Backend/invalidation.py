@@ -0,0 +1,221 @@
+"""
+Cross-worker invalidation of the in-process catalog caches.
+
+Every uvicorn worker keeps its own catalog_cache and comparison snapshot
+(compare.py). A bank or product write drops the affected entries in the
+worker that served it, and main.invalidate_catalog publishes the same tags
+on a bus; the other workers drop the entries carrying them when the message
+arrives. Buses, chosen with CACHE_INVALIDATION:
+
+- postgres (default on PostgreSQL): NOTIFY on CACHE_INVALIDATION_CHANNEL.
+  Each worker LISTENs on a dedicated connection, outside the pool, from a
+  background thread that also sends the worker's own notifications, so
+  publishing never blocks a request. After a lost connection the worker
+  reconnects and clears its caches, as it may have missed messages.
+- memory (default otherwise): delivers to the other MemoryBus instances
+  sharing its peers list. With one worker there is no one to tell; tests can
+  give several buses one list to stand in for workers.
+
+Handlers get the list of tags to drop, or None to drop everything.
+"""
+
+import collections
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Iterable, List, Optional
+
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION = os.getenv("CACHE_INVALIDATION", "").lower()
+CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "depositease_cache")
+
+# Idle listeners check their connection this often
+KEEPALIVE_SECONDS = 10.0
+# NOTIFY payloads must stay under 8000 bytes; larger tag lists clear everything
+MAX_PAYLOAD = 7900
+
+Handler = Callable[[Optional[List[str]]], None]
+
+
+class MemoryBus:
+    """In-process bus: delivers to the other buses in the same peers list"""
+
+    name = "memory"
+
+    def __init__(self, peers: Optional[list] = None):
+        self.peers = peers if peers is not None else []
+        self._handler: Optional[Handler] = None
+
+    def start(self, handler: Handler):
+        self._handler = handler
+        self.peers.append(self)
+
+    def stop(self):
+        if self in self.peers:
+            self.peers.remove(self)
+
+    def publish(self, tags: Iterable[str]):
+        tags = list(tags)
+        for peer in list(self.peers):
+            if peer is not self and peer._handler is not None:
+                peer._handler(tags)
+
+    def stats(self) -> dict:
+        return {"peers": len(self.peers)}
+
+
+class PostgresBus:
+    """Bus over PostgreSQL LISTEN/NOTIFY"""
+
+    name = "postgres"
+
+    def __init__(self, engine, channel: str = CHANNEL):
+        self.engine = engine
+        self.channel = channel
+        # Workers skip their own notifications, having already invalidated
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handler: Optional[Handler] = None
+        self._pending = collections.deque()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_writer.setblocking(False)
+        self.connected = False
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+        self.max_delay_ms = 0.0
+
+    def start(self, handler: Handler):
+        self._handler = handler
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Send what is still pending and close the connection"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def publish(self, tags: Iterable[str]):
+        """Queue tags for the other workers; returns at once"""
+        if self._thread is None:
+            return
+        payload = json.dumps({"origin": self.origin, "sent": time.time(), "tags": list(tags)})
+        if len(payload.encode()) > MAX_PAYLOAD:
+            payload = json.dumps({"origin": self.origin, "sent": time.time(), "tags": None})
+        self._pending.append(payload)
+        self._wake()
+
+    def stats(self) -> dict:
+        return {
+            "connected": int(self.connected),
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "max_delay_ms": round(self.max_delay_ms, 2),
+        }
+
+    def _wake(self):
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:
+            pass  # Buffer full: a wake-up is already pending
+
+    def _connect(self):
+        # A DBAPI connection of the engine's driver, made outside its pool
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        conn = self.engine.dialect.loaded_dbapi.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _run(self):
+        retry_delay = 0.5
+        was_connected = False
+        while not self._stopping.is_set():
+            try:
+                conn = self._connect()
+            except Exception as error:
+                logger.warning("Cache invalidation cannot connect, retrying in %.1fs: %s", retry_delay, error)
+                self._stopping.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, 30.0)
+                continue
+            retry_delay = 0.5
+            self.connected = True
+            if was_connected:
+                self.reconnects += 1
+                self._handler(None)
+            was_connected = True
+            try:
+                self._serve(conn)
+            except Exception as error:
+                logger.warning("Cache invalidation connection lost: %s", error)
+            finally:
+                self.connected = False
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _serve(self, conn):
+        while True:
+            self._send_pending(conn)
+            if self._stopping.is_set():
+                return
+            # Wakes on a notification, a publish or stop()
+            readable, _, _ = select.select([conn, self._wake_reader], [], [], KEEPALIVE_SECONDS)
+            if not readable:
+                # Quiet for a while: make sure the connection is still alive
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            if self._wake_reader in readable:
+                self._wake_reader.recv(4096)
+            conn.poll()
+            while conn.notifies:
+                self._deliver(conn.notifies.pop(0).payload)
+
+    def _send_pending(self, conn):
+        with conn.cursor() as cursor:
+            while self._pending:
+                # Dropped only once sent, so a lost connection retries it
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, self._pending[0]))
+                self._pending.popleft()
+                self.published += 1
+
+    def _deliver(self, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation: %r", payload)
+            return
+        if message.get("origin") == self.origin:
+            return
+        self.received += 1
+        self.max_delay_ms = max(self.max_delay_ms, (time.time() - message.get("sent", time.time())) * 1000)
+        self._handler(message.get("tags"))
+
+
+def create_bus():
+    kind = CACHE_INVALIDATION or ("postgres" if engine.dialect.name == "postgresql" else "memory")
+    if kind == "postgres":
+        return PostgresBus(engine)
+    if kind == "memory":
+        return MemoryBus()
+    raise ValueError(f"Unknown CACHE_INVALIDATION {kind!r}, expected postgres or memory")
+
+
+bus = create_bus()
@@ -1,18 +1,37 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Response, Cookie
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response, Cookie, File, Header, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timedelta
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, or_, select, tuple_
+from sqlalchemy.orm import Session, joinedload
+from pydantic import TypeAdapter
+from typing import List, Optional, Union
+from datetime import date, datetime, timedelta
 import models
 import schemas
 import auth
-from database import engine, get_db
+import pagination
+import compare
+import dashboard
+import catalog_csv
+import catalog_json
+import application_export
+import streaming
+import pool_metrics
+import request_metrics
+import invalidation
+from assets import static_assets
+from tenure import parse_tenure_months
+from cache import catalog_cache
+from database import async_endpoint, get_db
 from pathlib import Path
+import io
+import secrets
+import warmup
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Importing this module does not touch the database: create or upgrade the
+# schema with `python migrations.py` (or create_database.py) before serving.
 
 app = FastAPI(
     title="DepositEase API",
@@ -29,6 +48,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the latency it records covers the whole stack
+app.add_middleware(request_metrics.RequestMetricsMiddleware)
+
 # Get the frontend directory path
 frontend_dir = Path(__file__).parent.parent / "Frontend"
 
@@ -37,34 +59,47 @@ app.mount("/static", StaticFiles(directory=frontend_dir), name="static")
 
 # ==================== FRONTEND ROUTES ====================
 
+# Pages are served with asset URLs rewritten to fingerprinted, precompressed
+# copies (see assets.py); /styles.css and /script.js remain as the raw files.
+
+@app.on_event("startup")
+def build_assets():
+    static_assets.load()
+
+
+@app.on_event("startup")
+async def warm_up():
+    if warmup.WARMUP:
+        await warmup.warm_up(app)
+
 @app.get("/")
-def serve_home():
+def serve_home(request: Request):
     """Serve the home page"""
-    return FileResponse(frontend_dir / "index.html")
+    return static_assets.page(request, "index.html")
 
 @app.get("/login")
-def serve_login():
+def serve_login(request: Request):
     """Serve the login page"""
-    return FileResponse(frontend_dir / "login.html")
+    return static_assets.page(request, "login.html")
 
 @app.get("/admin")
-def serve_admin(access_token: Optional[str] = Cookie(None)):
+def serve_admin(request: Request, access_token: Optional[str] = Cookie(None)):
     """Serve the admin page (protected)"""
     if not access_token or not auth.verify_token(access_token):
         return RedirectResponse(url="/login", status_code=303)
-    return FileResponse(frontend_dir / "admin.html")
+    return static_assets.page(request, "admin.html")
 
 @app.get("/admin.html")
-def serve_admin_html(access_token: Optional[str] = Cookie(None)):
+def serve_admin_html(request: Request, access_token: Optional[str] = Cookie(None)):
     """Serve the admin page (protected)"""
     if not access_token or not auth.verify_token(access_token):
         return RedirectResponse(url="/login", status_code=303)
-    return FileResponse(frontend_dir / "admin.html")
+    return static_assets.page(request, "admin.html")
 
 @app.get("/index.html")
-def serve_index_html():
+def serve_index_html(request: Request):
     """Serve the home page"""
-    return FileResponse(frontend_dir / "index.html")
+    return static_assets.page(request, "index.html")
 
 @app.get("/styles.css")
 def serve_styles():
@@ -76,43 +111,59 @@ def serve_script():
     """Serve the JavaScript file"""
     return FileResponse(frontend_dir / "script.js")
 
+@app.get("/assets/{filename}")
+def serve_asset(filename: str, request: Request):
+    """Serve a fingerprinted CSS/JS file (cached for a year)"""
+    return static_assets.asset(request, filename)
+
 @app.get("/product-details.html")
-def serve_product_details():
+def serve_product_details(request: Request):
     """Serve the product details page"""
-    return FileResponse(frontend_dir / "product-details.html")
+    return static_assets.page(request, "product-details.html")
 
 @app.get("/application.html")
-def serve_application():
+def serve_application(request: Request):
     """Serve the application page"""
-    return FileResponse(frontend_dir / "application.html")
+    return static_assets.page(request, "application.html")
 
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
+def _find_admin(db: Session, username: str) -> Optional[models.Admin]:
+    return db.query(models.Admin).filter(models.Admin.username == username).first()
+
+def _save_admin(db: Session, admin: models.Admin) -> models.Admin:
+    db.add(admin)
+    db.commit()
+    auth.admin_cache.invalidate_admin(admin.username)
+    db.refresh(admin)
+    return admin
+
+# Register and login are async so bcrypt runs on auth.hash_pool; their short
+# database calls still go through the shared threadpool
 @app.post("/auth/register", response_model=schemas.Admin, status_code=status.HTTP_201_CREATED)
-def register_admin(admin: schemas.AdminRegister, db: Session = Depends(get_db)):
+async def register_admin(admin: schemas.AdminRegister, db: Session = Depends(get_db)):
     """Register a new admin"""
     # Check if username already exists
-    existing_admin = db.query(models.Admin).filter(models.Admin.username == admin.username).first()
+    existing_admin = await run_in_threadpool(_find_admin, db, admin.username)
     if existing_admin:
         raise HTTPException(status_code=400, detail="Username already registered")
     
     # Create new admin with hashed password
-    hashed_password = auth.get_password_hash(admin.password)
+    hashed_password = await auth.hash_pool.run(auth.get_password_hash, admin.password)
     new_admin = models.Admin(
         username=admin.username,
         password_hash=hashed_password
     )
-    db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
-    return new_admin
+    return await run_in_threadpool(_save_admin, db, new_admin)
 
 @app.post("/auth/login")
-def login_admin(response: Response, admin: schemas.AdminLogin, db: Session = Depends(get_db)):
+async def login_admin(response: Response, admin: schemas.AdminLogin, db: Session = Depends(get_db)):
     """Login admin and set cookie"""
     # Find admin by username
-    db_admin = db.query(models.Admin).filter(models.Admin.username == admin.username).first()
-    if not db_admin or not auth.verify_password(admin.password, db_admin.password_hash):
+    db_admin = await run_in_threadpool(_find_admin, db, admin.username)
+    if not db_admin or not await auth.hash_pool.run(
+        auth.verify_password, admin.password, db_admin.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -120,7 +171,7 @@ def login_admin(response: Response, admin: schemas.AdminLogin, db: Session = Dep
     
     # Update last login
     db_admin.last_login = datetime.now()
-    db.commit()
+    await run_in_threadpool(_save_admin, db, db_admin)
     
     # Create access token
     access_token = auth.create_access_token(data={"sub": admin.username})
@@ -137,24 +188,75 @@ def login_admin(response: Response, admin: schemas.AdminLogin, db: Session = Dep
     return {"message": "Login successful"}
 
 @app.post("/auth/logout")
-def logout_admin(response: Response):
+def logout_admin(response: Response, access_token: Optional[str] = Cookie(None)):
     """Logout admin by clearing cookie"""
+    if access_token:
+        auth.admin_cache.invalidate_token(access_token)
     response.delete_cookie(key="access_token")
     return {"message": "Logout successful"}
 
 @app.get("/auth/me", response_model=schemas.Admin)
-def get_current_admin_info(current_admin: models.Admin = Depends(auth.get_current_admin)):
+def get_current_admin_info(current_admin: schemas.Admin = Depends(auth.get_current_admin)):
     """Get current logged-in admin info"""
     return current_admin
 
 # ==================== API ENDPOINTS ====================
 
+# Bank and product reads are served from catalog_cache as serialized JSON;
+# the list endpoints build it from plain rows with catalog_json.
+# Entries are tagged with what they were built from:
+#   "banks" / "products"           every bank / product list
+#   "bank:<id>"                    GET /banks/<id>
+#   "product:<id>"                 GET /products/<id>
+#   "product-bank:<bank_id>"       GET /products/<id> of a product in that bank
+BANK_DETAIL = TypeAdapter(schemas.BankWithProducts)
+PRODUCT_DETAIL = TypeAdapter(schemas.ProductWithBank)
+
+
+def to_json(adapter: TypeAdapter, data) -> bytes:
+    """Serialize ORM objects exactly as response_model would"""
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def invalidate_catalog(*tags: str):
+    """Drop cached catalog responses and the comparison snapshot after a write,
+    here and (through the invalidation bus) in every other worker"""
+    compare.invalidate()
+    catalog_cache.invalidate(tags)
+    invalidation.bus.publish(tags)
+
+
+def drop_catalog_entries(tags: Optional[List[str]]):
+    """Apply an invalidation published by another worker (None: drop everything)"""
+    compare.invalidate()
+    if tags is None:
+        catalog_cache.clear()
+    else:
+        catalog_cache.invalidate(tags)
+
+
+@app.on_event("startup")
+def start_invalidation_bus():
+    invalidation.bus.start(drop_catalog_entries)
+
+
+@app.on_event("shutdown")
+def stop_invalidation_bus():
+    invalidation.bus.stop()
+
 @app.get("/api")
 def read_root():
     return {"message": "Welcome to DepositEase API", "status": "active"}
 
 
+# Endpoints marked @async_endpoint run on an AsyncSession when
+# DATABASE_MODE=async (see database.py) and in the threadpool otherwise
 @app.post("/banks", response_model=schemas.Bank, status_code=status.HTTP_201_CREATED)
+@async_endpoint
 def create_bank(bank: schemas.BankCreate, db: Session = Depends(get_db)):
     """Create a new bank"""
     # Check if bank name already exists
@@ -164,28 +266,70 @@ def create_bank(bank: schemas.BankCreate, db: Session = Depends(get_db)):
     
     new_bank = models.Bank(**bank.model_dump())
     db.add(new_bank)
+    dashboard.record(db, {dashboard.TOTAL_BANKS: 1})
     db.commit()
+    invalidate_catalog("banks")
     db.refresh(new_bank)
     return new_bank
 
 
 @app.get("/banks", response_model=List[schemas.BankWithProducts])
-def get_banks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all banks with their products"""
-    banks = db.query(models.Bank).offset(skip).limit(limit).all()
-    return banks
+@async_endpoint
+def get_banks(skip: int = 0, limit: int = 100, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get all banks with their products
+    
+    - fields: comma-separated bank fields to return, plus `products` for
+      whole products or `products.<field>` for single product fields
+      (e.g. `name,products.id`); id is always included
+    """
+    bank_fields, product_fields = catalog_json.parse_fields(
+        fields, catalog_json.BANK_FIELDS, "products", catalog_json.PRODUCT_FIELDS
+    )
+    key = ("banks", skip, limit, tuple(bank_fields), product_fields and tuple(product_fields))
+    body = catalog_cache.get(key)
+    if body is not None:
+        return json_response(body)
+    generation = catalog_cache.generation
+    
+    # Two statements: the banks, then all of their products (if requested)
+    banks = db.query(*catalog_json.bank_columns(bank_fields)).offset(skip).limit(limit).all()
+    products = (
+        db.query(models.Product.bank_id, *catalog_json.product_columns(product_fields))
+        .filter(models.Product.bank_id.in_([bank.id for bank in banks]))
+        .order_by(models.Product.id)
+        .all()
+    ) if banks and product_fields else []
+    body = catalog_json.banks_with_products(banks, products, bank_fields, product_fields)
+    catalog_cache.set(key, body, ["banks"], generation)
+    return json_response(body)
 
 
 @app.get("/banks/{bank_id}", response_model=schemas.BankWithProducts)
+@async_endpoint
 def get_bank(bank_id: int, db: Session = Depends(get_db)):
     """Get a specific bank with its products"""
-    bank = db.query(models.Bank).filter(models.Bank.id == bank_id).first()
+    key = ("bank", bank_id)
+    body = catalog_cache.get(key)
+    if body is not None:
+        return json_response(body)
+    generation = catalog_cache.generation
+    
+    # Single bank: one LEFT OUTER JOIN is cheaper than a second round trip
+    bank = (
+        db.query(models.Bank)
+        .options(joinedload(models.Bank.products))
+        .filter(models.Bank.id == bank_id)
+        .first()
+    )
     if not bank:
         raise HTTPException(status_code=404, detail="Bank not found")
-    return bank
+    body = to_json(BANK_DETAIL, bank)
+    catalog_cache.set(key, body, [f"bank:{bank_id}"], generation)
+    return json_response(body)
 
 
 @app.put("/banks/{bank_id}", response_model=schemas.Bank)
+@async_endpoint
 def update_bank(bank_id: int, bank: schemas.BankUpdate, db: Session = Depends(get_db)):
     """Update a bank"""
     db_bank = db.query(models.Bank).filter(models.Bank.id == bank_id).first()
@@ -197,25 +341,35 @@ def update_bank(bank_id: int, bank: schemas.BankUpdate, db: Session = Depends(ge
         setattr(db_bank, key, value)
     
     db.commit()
+    invalidate_catalog("banks", "products", f"bank:{bank_id}", f"product-bank:{bank_id}")
     db.refresh(db_bank)
     return db_bank
 
 
 @app.delete("/banks/{bank_id}", status_code=status.HTTP_204_NO_CONTENT)
+@async_endpoint
 def delete_bank(bank_id: int, db: Session = Depends(get_db)):
     """Delete a bank (will also delete all associated products)"""
     db_bank = db.query(models.Bank).filter(models.Bank.id == bank_id).first()
     if not db_bank:
         raise HTTPException(status_code=404, detail="Bank not found")
     
+    product_ids = select(models.Product.id).where(models.Product.bank_id == bank_id)
+    dashboard.record(db, {
+        dashboard.TOTAL_BANKS: -1,
+        dashboard.TOTAL_PRODUCTS: -len(db_bank.products),
+    })
+    dashboard.record_removed_applications(db, models.Application.product_id.in_(product_ids))
     db.delete(db_bank)
     db.commit()
+    invalidate_catalog("banks", "products", f"bank:{bank_id}", f"product-bank:{bank_id}")
     return None
 
 
 # ==================== PRODUCT ENDPOINTS ====================
 
 @app.post("/products", response_model=schemas.Product, status_code=status.HTTP_201_CREATED)
+@async_endpoint
 def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)):
     """Create a new product"""
     # Check if bank exists
@@ -225,82 +379,222 @@ def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)
     
     new_product = models.Product(**product.model_dump())
     db.add(new_product)
+    dashboard.record(db, {dashboard.TOTAL_PRODUCTS: 1})
     db.commit()
+    invalidate_catalog("banks", "products", f"bank:{product.bank_id}")
     db.refresh(new_product)
     return new_product
 
 
+PRODUCT_SORTS = {
+    "tenure_months": models.Product.tenure_months.asc(),
+    "-tenure_months": models.Product.tenure_months.desc(),
+    "interest_rate": models.Product.interest_rate.asc(),
+    "-interest_rate": models.Product.interest_rate.desc(),
+}
+
+
 @app.get("/products", response_model=List[schemas.ProductWithBank])
+@async_endpoint
 def get_products(
     skip: int = 0,
     limit: int = 100,
     type: Optional[str] = None,
     bank_id: Optional[int] = None,
+    bank_name: Optional[str] = None,
+    tenure_months: Optional[int] = None,
+    min_rate: Optional[float] = None,
+    max_rate: Optional[float] = None,
+    amount: Optional[float] = None,
+    active_only: bool = False,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all products with optional filters"""
-    query = db.query(models.Product)
+    """Get all products with optional filters
+    
+    - bank_name: case-insensitive substring of the bank name
+    - tenure_months: products with this tenure
+    - min_rate / max_rate: interest rate range (inclusive)
+    - amount: products whose min/max deposit range accepts this amount
+    - active_only: skip inactive products and products of inactive banks
+    - sort: tenure_months or interest_rate, prefixed with "-" for descending
+    - fields: comma-separated product fields to return, plus `bank` for the
+      whole bank or `bank.<field>` for single bank fields
+      (e.g. `name,interest_rate,bank.name`); id is always included
+    """
+    if sort is not None and sort not in PRODUCT_SORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort, expected one of: {', '.join(PRODUCT_SORTS)}")
+    
+    product_fields, bank_fields = catalog_json.parse_fields(
+        fields, catalog_json.PRODUCT_FIELDS, "bank", catalog_json.BANK_FIELDS
+    )
+    key = (
+        "products", skip, limit, type, bank_id, bank_name, tenure_months,
+        min_rate, max_rate, amount, active_only, sort,
+        tuple(product_fields), bank_fields and tuple(bank_fields)
+    )
+    body = catalog_cache.get(key)
+    if body is not None:
+        return json_response(body)
+    generation = catalog_cache.generation
+    
+    # Many-to-one, so the bank columns come from the same statement through
+    # the join (which the bank filters reuse). Only the requested fields are
+    # selected, which leaves out the Text columns unless they are asked for.
+    query = (
+        db.query(*catalog_json.product_columns(product_fields), *catalog_json.bank_columns(bank_fields or []))
+        .select_from(models.Product)
+        .join(models.Product.bank)
+    )
     
     if type:
         query = query.filter(models.Product.type == type)
     if bank_id:
         query = query.filter(models.Product.bank_id == bank_id)
+    if bank_name:
+        pattern = bank_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.filter(models.Bank.name.ilike(f"%{pattern}%", escape="\\"))
+    if tenure_months is not None:
+        query = query.filter(models.Product.tenure_months == tenure_months)
+    if min_rate is not None:
+        query = query.filter(models.Product.interest_rate >= min_rate)
+    if max_rate is not None:
+        query = query.filter(models.Product.interest_rate <= max_rate)
+    if amount is not None:
+        query = query.filter(
+            models.Product.min_deposit <= amount,
+            or_(models.Product.max_deposit.is_(None), models.Product.max_deposit >= amount)
+        )
+    if active_only:
+        query = query.filter(models.Product.is_active.is_(True), models.Bank.is_active.is_(True))
+    
+    if sort:
+        query = query.order_by(PRODUCT_SORTS[sort], models.Product.id)
+    
+    rows = query.offset(skip).limit(limit).all()
+    body = catalog_json.products_with_bank(rows, product_fields, bank_fields)
+    catalog_cache.set(key, body, ["products"], generation)
+    return json_response(body)
+
+
+@app.post("/products/compare", response_model=schemas.ProductCompareResponse)
+@async_endpoint
+def compare_products(request: schemas.ProductCompareRequest, db: Session = Depends(get_db)):
+    """Rank every matching product by maturity amount and effective annual yield
+    
+    Matching products are active, accept the principal within their deposit
+    range and (optionally) have the requested tenure and type. Interest uses
+    each product's compounding frequency, in one vectorized pass over an
+    in-memory snapshot of the catalog.
+    """
+    matrix = compare.get_matrix(db)
+    candidates = matrix.match(request.principal, request.tenure_months, request.type)
     
-    products = query.offset(skip).limit(limit).all()
-    return products
+    amount, annual_yield = compare.maturity(
+        request.principal,
+        matrix.rates[candidates],
+        matrix.periods[candidates],
+        matrix.months[candidates]
+    )
+    # p indexes the candidate arrays, i the snapshot
+    results = []
+    for p in compare.rank(amount, annual_yield)[:request.limit].tolist():
+        i = int(candidates[p])
+        results.append({
+            "product_id": int(matrix.ids[i]),
+            "bank_id": int(matrix.bank_ids[i]),
+            "bank_name": matrix.bank_names[i],
+            "name": matrix.names[i],
+            "type": matrix.types[i],
+            "interest_rate": float(matrix.rates[i]),
+            "compounding_frequency": matrix.frequencies[i],
+            "tenure_months": int(matrix.months[i]),
+            "maturity_amount": round(float(amount[p]), 2),
+            "interest_earned": round(float(amount[p]) - request.principal, 2),
+            "effective_annual_yield": round(float(annual_yield[p]) * 100, 4),
+        })
+    return {"principal": request.principal, "total": len(candidates), "results": results}
 
 
 @app.get("/products/{product_id}", response_model=schemas.ProductWithBank)
+@async_endpoint
 def get_product(product_id: int, db: Session = Depends(get_db)):
     """Get a specific product with bank details"""
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
+    key = ("product", product_id)
+    body = catalog_cache.get(key)
+    if body is not None:
+        return json_response(body)
+    generation = catalog_cache.generation
+    
+    product = (
+        db.query(models.Product)
+        .options(joinedload(models.Product.bank))
+        .filter(models.Product.id == product_id)
+        .first()
+    )
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    body = to_json(PRODUCT_DETAIL, product)
+    catalog_cache.set(key, body, [f"product:{product_id}", f"product-bank:{product.bank_id}"], generation)
+    return json_response(body)
 
 
 @app.get("/banks/{bank_id}/products", response_model=List[schemas.Product])
+@async_endpoint
 def get_bank_products(bank_id: int, db: Session = Depends(get_db)):
     """Get all products for a specific bank"""
     bank = db.query(models.Bank).filter(models.Bank.id == bank_id).first()
     if not bank:
         raise HTTPException(status_code=404, detail="Bank not found")
     
-    products = db.query(models.Product).filter(models.Product.bank_id == bank_id).all()
-    return products
+    products = db.query(*catalog_json.PRODUCT_COLUMNS).filter(models.Product.bank_id == bank_id).all()
+    return json_response(catalog_json.products(products))
 
 
 @app.put("/products/{product_id}", response_model=schemas.Product)
+@async_endpoint
 def update_product(product_id: int, product: schemas.ProductUpdate, db: Session = Depends(get_db)):
     """Update a product"""
     db_product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    old_bank_id = db_product.bank_id
     update_data = product.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_product, key, value)
     
     db.commit()
+    invalidate_catalog(
+        "banks", "products", f"product:{product_id}",
+        f"bank:{old_bank_id}", f"bank:{db_product.bank_id}"
+    )
     db.refresh(db_product)
     return db_product
 
 
 @app.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+@async_endpoint
 def delete_product(product_id: int, db: Session = Depends(get_db)):
     """Delete a product"""
     db_product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    bank_id = db_product.bank_id
+    dashboard.record(db, {dashboard.TOTAL_PRODUCTS: -1})
+    dashboard.record_removed_applications(db, models.Application.product_id == product_id)
     db.delete(db_product)
     db.commit()
+    invalidate_catalog("banks", "products", f"product:{product_id}", f"bank:{bank_id}")
     return None
 
 
 # ==================== APPLICATION ENDPOINTS ====================
 
 @app.post("/applications", response_model=schemas.Application, status_code=status.HTTP_201_CREATED)
+@async_endpoint
 def create_application(application: schemas.ApplicationCreate, db: Session = Depends(get_db)):
     """Create a new application"""
     # Check if product exists
@@ -310,29 +604,145 @@ def create_application(application: schemas.ApplicationCreate, db: Session = Dep
     
     new_application = models.Application(**application.model_dump())
     db.add(new_application)
+    dashboard.record_transition(db, [], dashboard.application_keys("pending", None))
     db.commit()
     db.refresh(new_application)
     return new_application
 
+@app.post("/applications/batch", response_model=schemas.ApplicationBatchResult)
+@async_endpoint
+def create_applications_batch(batch: schemas.ApplicationBatchCreate, db: Session = Depends(get_db)):
+    """Create many applications in one transaction (e.g. replayed from offline kiosks)
+    
+    Rows referencing an unknown product are reported and skipped; the rest
+    are inserted together.
+    """
+    # One lookup for every product referenced by the batch
+    product_ids = {application.product_id for application in batch.applications}
+    existing = {row[0] for row in db.query(models.Product.id).filter(models.Product.id.in_(product_ids))}
+    
+    results = []
+    rows = []
+    # Bulk inserts bypass the @validates hook, so parse each distinct tenure here
+    tenure_months = {}
+    for index, application in enumerate(batch.applications):
+        if application.product_id not in existing:
+            results.append({"index": index, "status": "error", "detail": "Product not found"})
+            continue
+        row = application.model_dump()
+        tenure = row["tenure_selected"]
+        if tenure not in tenure_months:
+            tenure_months[tenure] = parse_tenure_months(tenure)
+        row["tenure_months"] = tenure_months[tenure]
+        row["status"] = "pending"
+        rows.append(row)
+        results.append({"index": index, "status": "created"})
+    
+    if rows:
+        # executemany, batched by SQLAlchemy into multi-row INSERT ... RETURNING
+        new_ids = db.execute(
+            insert(models.Application).returning(models.Application.id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
+        created = iter(new_ids)
+        for result in results:
+            if result["status"] == "created":
+                result["id"] = next(created)
+        dashboard.record(db, {dashboard.PENDING: len(rows)})
+        db.commit()
+    
+    return {"created": len(rows), "failed": len(results) - len(rows), "results": results}
+
 
-@app.get("/applications", response_model=List[schemas.Application])
+@app.get(
+    "/applications",
+    response_model=Union[List[schemas.Application], schemas.ApplicationPage]
+)
+@async_endpoint
 def get_applications(
     skip: int = 0,
     limit: int = 100,
     status_filter: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all applications with optional status filter"""
+    """Get all applications with optional status filter
+
+    Passing `cursor` (empty for the first page) switches to keyset pagination:
+    the response becomes {"items": [...], "next_cursor": ...} and `skip` is ignored.
+    """
     query = db.query(models.Application)
     
     if status_filter:
         query = query.filter(models.Application.status == status_filter)
     
-    applications = query.order_by(models.Application.created_at.desc()).offset(skip).limit(limit).all()
-    return applications
+    if cursor is None:
+        applications = query.order_by(models.Application.created_at.desc()).offset(skip).limit(limit).all()
+        return applications
+    
+    # Keyset mode: seek past the last (created_at, id) seen, which the
+    # composite indexes serve without scanning the skipped rows
+    position = pagination.decode_cursor(cursor)
+    if position:
+        query = query.filter(
+            tuple_(models.Application.created_at, models.Application.id) < tuple_(*position)
+        )
+    
+    applications = query.order_by(
+        models.Application.created_at.desc(),
+        models.Application.id.desc()
+    ).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(applications) > limit:
+        applications = applications[:limit]
+        last = applications[-1]
+        next_cursor = pagination.encode_cursor(last.created_at, last.id)
+    
+    return {"items": applications, "next_cursor": next_cursor}
+
+
+@app.post("/applications/bulk-status", response_model=List[schemas.Application])
+@async_endpoint
+def update_applications_status(
+    change: schemas.ApplicationBulkStatus,
+    db: Session = Depends(get_db),
+    current_admin: schemas.Admin = Depends(auth.get_current_admin)
+):
+    """Set status, reviewed_by and reviewed_at on many applications at once (protected)
+    
+    Applies to the applications matching all of the given ids and filters,
+    in a single UPDATE, and returns the updated rows.
+    """
+    criteria = []
+    if change.ids is not None:
+        criteria.append(models.Application.id.in_(change.ids))
+    if change.status_filter:
+        criteria.append(models.Application.status == change.status_filter)
+    if change.product_id is not None:
+        criteria.append(models.Application.product_id == change.product_id)
+    if change.created_from is not None:
+        criteria.append(models.Application.created_at >= change.created_from)
+    if change.created_to is not None:
+        criteria.append(models.Application.created_at < change.created_to)
+    
+    applications = dashboard.update_applications(db, criteria, {
+        "status": change.status,
+        "reviewed_by": change.reviewed_by or current_admin.username,
+        "reviewed_at": datetime.now(),
+    })
+    
+    # Serialize before commit() expires the rows, which would reload each one
+    updated = [
+        schemas.Application.model_validate(application)
+        for application in sorted(applications, key=lambda application: application.id)
+    ]
+    db.commit()
+    return updated
 
 
 @app.get("/applications/{application_id}", response_model=schemas.Application)
+@async_endpoint
 def get_application(application_id: int, db: Session = Depends(get_db)):
     """Get a specific application"""
     application = db.query(models.Application).filter(models.Application.id == application_id).first()
@@ -342,6 +752,7 @@ def get_application(application_id: int, db: Session = Depends(get_db)):
 
 
 @app.put("/applications/{application_id}", response_model=schemas.Application)
+@async_endpoint
 def update_application(
     application_id: int,
     application: schemas.ApplicationUpdate,
@@ -352,6 +763,7 @@ def update_application(
     if not db_application:
         raise HTTPException(status_code=404, detail="Application not found")
     
+    counted_before = dashboard.application_keys(db_application.status, db_application.reviewed_at)
     update_data = application.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_application, key, value)
@@ -361,49 +773,147 @@ def update_application(
         from datetime import datetime
         db_application.reviewed_at = datetime.now()
     
+    dashboard.record_transition(
+        db, counted_before,
+        dashboard.application_keys(db_application.status, db_application.reviewed_at)
+    )
     db.commit()
     db.refresh(db_application)
     return db_application
 
 
 @app.delete("/applications/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
+@async_endpoint
 def delete_application(application_id: int, db: Session = Depends(get_db)):
     """Delete an application"""
     db_application = db.query(models.Application).filter(models.Application.id == application_id).first()
     if not db_application:
         raise HTTPException(status_code=404, detail="Application not found")
     
+    dashboard.record_transition(
+        db, dashboard.application_keys(db_application.status, db_application.reviewed_at), []
+    )
     db.delete(db_application)
     db.commit()
     return None
 
 
+# ==================== ADMIN IMPORT / EXPORT ====================
+
+@app.post("/admin/import/products", response_model=schemas.ProductImportResult)
+def import_products_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_admin: schemas.Admin = Depends(auth.get_current_admin)
+):
+    """Create or update products from an uploaded CSV (protected)
+    
+    See catalog_csv for the columns and how rows are matched to existing
+    products. Invalid rows are reported and skipped; the rest are committed
+    together.
+    """
+    # The upload is spooled to disk by the framework and read line by line
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = catalog_csv.import_products(db, lines)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    finally:
+        lines.detach()
+    
+    dashboard.record(db, {dashboard.TOTAL_PRODUCTS: report.created})
+    db.commit()
+    invalidate_catalog(
+        "banks", "products",
+        *(f"bank:{bank_id}" for bank_id in report.bank_ids),
+        *(f"product:{product_id}" for product_id in report.product_ids)
+    )
+    return report.result()
+
+@app.get("/admin/export/products")
+def export_products_csv(current_admin: schemas.Admin = Depends(auth.get_current_admin)):
+    """Stream every product as CSV, in the format the import accepts (protected)"""
+    return StreamingResponse(
+        streaming.with_session(catalog_csv.export_products),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="products.csv"'}
+    )
+
+
+@app.get("/admin/export/applications")
+def export_applications(
+    format: str = "csv",
+    status_filter: Optional[str] = None,
+    created_from: Optional[Union[datetime, date]] = None,
+    created_to: Optional[Union[datetime, date]] = None,
+    current_admin: schemas.Admin = Depends(auth.get_current_admin)
+):
+    """Stream applications as CSV or NDJSON (protected)
+    
+    - format: csv or ndjson
+    - status_filter: only applications with this status
+    - created_from / created_to: creation time range, from inclusive and to
+      exclusive (e.g. 2024-05-01 and 2024-06-01 for May)
+    """
+    if format not in application_export.EXPORTERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format, expected one of: {', '.join(application_export.EXPORTERS)}"
+        )
+    
+    query = application_export.build_query(status_filter, created_from, created_to)
+    return StreamingResponse(
+        streaming.with_session(application_export.EXPORTERS[format], query),
+        media_type=application_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="applications.{format}"'}
+    )
+
+
 # ==================== STATISTICS ENDPOINTS ====================
 
 @app.get("/stats/dashboard")
 def get_dashboard_stats(
     db: Session = Depends(get_db),
-    current_admin: models.Admin = Depends(auth.get_current_admin)
+    current_admin: schemas.Admin = Depends(auth.get_current_admin)
 ):
     """Get dashboard statistics (protected)"""
-    total_banks = db.query(models.Bank).count()
-    total_products = db.query(models.Product).count()
-    pending_applications = db.query(models.Application).filter(models.Application.status == "pending").count()
-    
-    # Get approved today
-    from datetime import datetime, timedelta
-    today = datetime.now().date()
-    approved_today = db.query(models.Application).filter(
-        models.Application.status == "approved",
-        models.Application.reviewed_at >= today
-    ).count()
-    
-    return {
-        "total_banks": total_banks,
-        "total_products": total_products,
-        "pending_applications": pending_applications,
-        "approved_today": approved_today
-    }
+    if dashboard.SUMMARY_MODE:
+        return dashboard.summary_stats(db)
+    return dashboard.aggregate_stats(db)
+
+
+@app.get("/stats/cache")
+def get_cache_stats(current_admin: schemas.Admin = Depends(auth.get_current_admin)):
+    """Get catalog cache hit/miss counters (protected)"""
+    return {"catalog": catalog_cache.stats()}
+
+@app.get("/stats/pool")
+def get_pool_stats(current_admin: schemas.Admin = Depends(auth.get_current_admin)):
+    """Get database pool checkouts, overflow and cumulative wait time (protected)"""
+    return pool_metrics.stats()
+
+@app.get("/stats/hashing")
+def get_hashing_stats(current_admin: schemas.Admin = Depends(auth.get_current_admin)):
+    """Get bcrypt pool occupancy, rejections and hash latency (protected)"""
+    return auth.hash_pool.stats()
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus metrics: per-route latency, SQL and bcrypt time, pool, cache and hashing stats
+    
+    Protected by METRICS_TOKEN (as a bearer token) when that is set.
+    """
+    if request_metrics.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {request_metrics.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    body = request_metrics.render([
+        request_metrics.render_stats("db_pool", pool_metrics.stats(), "engine"),
+        request_metrics.render_stats("cache", {"catalog": catalog_cache.stats()}, "cache"),
+        request_metrics.render_stats("hashing", {"bcrypt": auth.hash_pool.stats()}, "pool"),
+        request_metrics.render_stats("cache_invalidation", {invalidation.bus.name: invalidation.bus.stats()}, "bus"),
+    ])
+    return Response(content=body, media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,233 @@
+"""
+Versioned Schema Migrations for DepositEase
+
+create_all only creates missing tables, so columns and indexes added to
+models.py after a database was created never reach it. Each migration below
+brings the schema one step forward; applied versions are recorded in the
+schema_migrations table and `python migrations.py` applies the rest in
+order. Every migration checks what is already in place (IF NOT EXISTS,
+inspector lookups), so databases created before migrations existed, by
+create_all or create_database.py, simply run them all.
+
+On PostgreSQL indexes are built with CREATE INDEX CONCURRENTLY, which does
+not block writes to the table but cannot run inside a transaction, so those
+migrations run in autocommit mode. A concurrent build that fails leaves an
+INVALID index behind; the next run drops and rebuilds it.
+
+To add a migration, add the column or index to models.py (so new databases
+get it from create_all) and append a function decorated with
+@migration(<next version>, "<description>") that adds it to existing ones.
+
+Usage:
+    python migrations.py            # apply pending migrations
+    python migrations.py status     # list applied and pending migrations
+"""
+
+import argparse
+import sys
+from contextlib import contextmanager
+from typing import Callable, List, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex, DropIndex
+from sqlalchemy.sql import func
+
+import backfill_tenure_months
+import models
+from database import Base, engine as default_engine
+
+history = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+# Held while migrating so two deploys cannot apply the same migration at once
+ADVISORY_LOCK_KEY = 7218404211
+
+
+class Migration:
+    def __init__(self, version: int, name: str, upgrade: Callable[[Connection], None], transactional: bool):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+        # False for migrations that build indexes concurrently
+        self.transactional = transactional
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str, transactional: bool = True):
+    """Register the decorated function as migration `version`"""
+    def register(upgrade):
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"Migration {version} is out of order")
+        MIGRATIONS.append(Migration(version, name, upgrade, transactional))
+        return upgrade
+    return register
+
+
+# ==================== HELPERS ====================
+
+def _index(model, name: str):
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+@contextmanager
+def _concurrently(index):
+    options = index.dialect_options["postgresql"]
+    previous = options["concurrently"]
+    options["concurrently"] = True
+    try:
+        yield
+    finally:
+        options["concurrently"] = previous
+
+
+def _is_invalid(conn: Connection, name: str) -> bool:
+    """True if a failed concurrent build left an INVALID index called name"""
+    return conn.execute(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name}
+    ).scalar() is True
+
+
+def create_indexes(conn: Connection, model, *names: str):
+    """Create the named indexes of model's table unless they exist"""
+    for name in names:
+        index = _index(model, name)
+        if conn.dialect.name != "postgresql":
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        else:
+            with _concurrently(index):
+                if _is_invalid(conn, name):
+                    conn.execute(DropIndex(index, if_exists=True))
+                    print(f"  Dropped invalid index {name}")
+                conn.execute(CreateIndex(index, if_not_exists=True))
+        print(f"  ✓ Index {name} in place")
+
+
+# ==================== MIGRATIONS ====================
+
+@migration(1, "create tables")
+def create_tables(conn: Connection):
+    # New databases get every column and index of models.py here; the later
+    # migrations then find their changes already in place
+    Base.metadata.create_all(bind=conn)
+
+
+@migration(2, "add and backfill tenure_months columns")
+def add_tenure_months(conn: Connection):
+    backfill_tenure_months.add_missing_columns(conn)
+    backfill_tenure_months.backfill(conn)
+
+
+@migration(3, "add product search indexes", transactional=False)
+def add_product_search_indexes(conn: Connection):
+    create_indexes(
+        conn, models.Product,
+        "ix_products_active_interest_rate", "ix_products_min_deposit", "ix_products_tenure_months",
+    )
+    if models.pg_trgm_available(conn):
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        create_indexes(conn, models.Bank, "ix_banks_name_trgm")
+
+
+@migration(4, "add application keyset pagination indexes", transactional=False)
+def add_application_keyset_indexes(conn: Connection):
+    create_indexes(conn, models.Application, "ix_applications_created_at_id", "ix_applications_status_created_at_id")
+
+
+@migration(5, "add product (bank_id, name) index", transactional=False)
+def add_product_bank_name_index(conn: Connection):
+    create_indexes(conn, models.Product, "ix_products_bank_id_name")
+
+
+@migration(6, "add product type and application product_id indexes", transactional=False)
+def add_filter_indexes(conn: Connection):
+    # products.bank_id is served by ix_products_bank_id_name, and
+    # applications.status / created_at by the keyset indexes
+    create_indexes(conn, models.Product, "ix_products_type")
+    create_indexes(conn, models.Application, "ix_applications_product_id")
+
+
+@migration(7, "re-parse tenure_months with the anchored tenure parser")
+def reparse_tenure_months(conn: Connection):
+    # The first parser read "90 days" as 90 months and "1.5 years" as 1
+    backfill_tenure_months.backfill(conn)
+
+
+# ==================== RUNNER ====================
+
+@contextmanager
+def _migration_lock(engine: Engine):
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    # Autocommit, so this session holds no snapshot for CREATE INDEX CONCURRENTLY to wait on
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+
+def applied_versions(engine: Engine = default_engine) -> Set[int]:
+    history.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(select(history.c.version)).scalars())
+
+
+def _apply(engine: Engine, step: Migration):
+    if step.transactional:
+        with engine.begin() as conn:
+            step.upgrade(conn)
+            conn.execute(insert(history).values(version=step.version, name=step.name))
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        step.upgrade(conn)
+        conn.execute(insert(history).values(version=step.version, name=step.name))
+
+
+def upgrade(engine: Engine = default_engine) -> List[int]:
+    """Apply every pending migration in order; return the versions applied"""
+    with _migration_lock(engine):
+        applied = applied_versions(engine)
+        done = []
+        for step in MIGRATIONS:
+            if step.version in applied:
+                continue
+            print(f"Applying {step.version:04d} {step.name}...")
+            _apply(engine, step)
+            done.append(step.version)
+        return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DepositEase schema migrations")
+    parser.add_argument("command", nargs="?", choices=["upgrade", "status"], default="upgrade")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        applied = applied_versions()
+        for step in MIGRATIONS:
+            print(f"{'✓' if step.version in applied else ' '} {step.version:04d} {step.name}")
+        return
+
+    try:
+        done = upgrade()
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        sys.exit(1)
+    if done:
+        print(f"\n✓ Applied {len(done)} migration(s); schema is at version {MIGRATIONS[-1].version}")
+    else:
+        print(f"✓ Schema is up to date (version {MIGRATIONS[-1].version})")
+
+
+if __name__ == "__main__":
+    main()
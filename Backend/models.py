@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Float, ForeignKey, DateTime, Boolean, Index, DDL, event
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from database import Base
+from tenure import parse_tenure_months
 
 class Admin(Base):
     __tablename__ = "admins"
@@ -28,6 +29,34 @@ class Bank(Base):
     
     # Relationship with products
     products = relationship("Product", back_populates="bank", cascade="all, delete-orphan")
+    
+    # Trigram index so the bank-name substring search (ILIKE '%...%') on
+    # GET /products does not scan the table; only where pg_trgm is installed
+    __table_args__ = (
+        Index(
+            "ix_banks_name_trgm", "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(callable_=lambda ddl, target, bind, **kw: pg_trgm_available(bind)),
+    )
+
+
+def pg_trgm_available(bind) -> bool:
+    """True on PostgreSQL servers that ship the pg_trgm extension"""
+    if bind.dialect.name != "postgresql":
+        return False
+    return bind.exec_driver_sql(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    ).scalar() is not None
+
+
+event.listen(
+    Bank.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        callable_=lambda ddl, target, bind, **kw: pg_trgm_available(bind)
+    ),
+)
 
 
 class Product(Base):
@@ -42,6 +71,7 @@ class Product(Base):
     interest_rate = Column(Float, nullable=False)  # Interest rate in percentage
     min_deposit = Column(Float, nullable=False)  # Minimum deposit amount
     tenure = Column(String(100), nullable=False)  # e.g., "12 months", "24 months"
+    tenure_months = Column(Integer, nullable=True)  # Parsed from tenure on write
     
     # Detailed Information
     product_overview = Column(Text, nullable=True)
@@ -61,6 +91,22 @@ class Product(Base):
     
     # Relationship with bank
     bank = relationship("Bank", back_populates="products")
+    
+    # Indexes for the GET /products search filters
+    __table_args__ = (
+        Index("ix_products_active_interest_rate", "is_active", "interest_rate"),
+        Index("ix_products_min_deposit", "min_deposit"),
+        Index("ix_products_tenure_months", "tenure_months"),
+        # CSV import matches rows to existing products on (bank_id, name);
+        # also serves bank_id lookups and the banks.id ON DELETE CASCADE
+        Index("ix_products_bank_id_name", "bank_id", "name"),
+        Index("ix_products_type", "type"),
+    )
+    
+    @validates("tenure")
+    def _set_tenure_months(self, key, value):
+        self.tenure_months = parse_tenure_months(value)
+        return value
 
 
 class Application(Base):
@@ -79,6 +125,7 @@ class Application(Base):
     # Application Details
     deposit_amount = Column(Float, nullable=False)
     tenure_selected = Column(String(100), nullable=False)
+    tenure_months = Column(Integer, nullable=True)  # Parsed from tenure_selected on write
     status = Column(String(50), default="pending")  # pending, approved, rejected
     notes = Column(Text, nullable=True)
     
@@ -91,3 +138,25 @@ class Application(Base):
     
     # Relationship with product
     product = relationship("Product")
+
+    # Keyset pagination on GET /applications walks (created_at, id) in
+    # descending order, optionally within a single status
+    __table_args__ = (
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        Index("ix_applications_status_created_at_id", "status", "created_at", "id"),
+        # Bulk status updates filter on product_id, and product deletes cascade to it
+        Index("ix_applications_product_id", "product_id"),
+    )
+    
+    @validates("tenure_selected")
+    def _set_tenure_months(self, key, value):
+        self.tenure_months = parse_tenure_months(value)
+        return value
+
+
+class DashboardCounter(Base):
+    """Incrementally maintained dashboard counters (DASHBOARD_STATS_MODE=summary)"""
+    __tablename__ = "dashboard_counters"
+    
+    key = Column(String(50), primary_key=True)  # e.g. "pending_applications", "approved:2024-01-15"
+    value = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,131 @@
+"""
+Connection pool metrics for GET /stats/pool.
+
+Checkouts, checkins, new connections and invalidations are counted through
+pool event hooks. The pool has no event for "started waiting", so the time
+spent acquiring a connection (waiting for a free one, or opening a new one
+within the overflow) is measured by the MeteredQueuePool classes around
+Pool.connect().
+"""
+
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Cumulative counters for one engine's pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        # Every Pool.connect() call, whether it got a connection or timed out
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeout_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def attach(self, engine):
+        """Listen to the pool events of engine (sync Engine)"""
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float, timed_out: bool):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+                self.timeout_wait_seconds += seconds
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(0, pool.overflow()),
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "wait_seconds_total": round(self.wait_seconds, 6),
+                # Includes the waits that ended in a timeout, so it averages over all of them
+                "wait_ms_avg": round(self.wait_seconds / self.waits * 1000, 3) if self.waits else 0.0,
+                "timeout_wait_seconds_total": round(self.timeout_wait_seconds, 6),
+                "wait_ms_max": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class _MeteredPoolMixin:
+    metrics = None
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out)
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_engines: Dict[str, tuple] = {}
+
+
+def instrument(name: str, engine) -> PoolMetrics:
+    """Start collecting metrics for engine (a sync Engine) under name"""
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+    metrics.attach(engine)
+    _engines[name] = (engine, metrics)
+    return metrics
+
+
+def stats() -> dict:
+    """Current metrics for every instrumented engine"""
+    return {name: metrics.snapshot(engine.pool) for name, (engine, metrics) in _engines.items()}
@@ -0,0 +1,237 @@
+"""
+Per-request instrumentation for GET /metrics.
+
+RequestMetricsMiddleware times every request and files it under its route
+template (/products/{product_id}, not the raw path). While a request runs,
+a RequestTimings object in a context variable collects:
+- SQL statements and the time spent in them, from before/after_cursor_execute
+  hooks on the engines (see instrument())
+- bcrypt time, including the wait for a pool thread, from auth.HashPool.run
+Whatever is left is application time: validation, serialization and the
+endpoint's own work.
+
+render() writes it all in the Prometheus text format. With
+SERVER_TIMING=true every response also carries a Server-Timing header
+(db, hash, app, total) that browser dev tools show per request; for a
+streamed response it covers the time until the headers were sent.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+# Bearer token GET /metrics requires, if set
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+PREFIX = "depositease"
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestTimings:
+    """What one request spent its time on so far"""
+
+    __slots__ = ("statements", "db_seconds", "hash_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        app_seconds = max(0.0, total_seconds - self.db_seconds - self.hash_seconds)
+        parts = [f'db;dur={self.db_seconds * 1000:.1f};desc="{self.statements} statements"']
+        if self.hash_seconds:
+            parts.append(f"hash;dur={self.hash_seconds * 1000:.1f}")
+        parts.append(f"app;dur={app_seconds * 1000:.1f}")
+        parts.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(parts)
+
+
+# The request being served; copied into threadpool threads and the greenlets
+# async sessions run on, so the hooks below see it there too
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+def record_hash(seconds: float):
+    """Attribute bcrypt time to the current request"""
+    timings = _current.get()
+    if timings is not None:
+        timings.hash_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._request_metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    if timings is not None:
+        timings.statements += 1
+        timings.db_seconds += time.perf_counter() - context._request_metrics_start
+
+
+def instrument(engine):
+    """Attribute statements run on engine (a sync Engine) to requests"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Cumulative per-route request metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.durations: Dict[Tuple[str, str], _Histogram] = {}
+        self.db_durations: Dict[Tuple[str, str], _Histogram] = {}
+        self.statements: Dict[Tuple[str, str], int] = {}
+        self.hash_seconds: Dict[Tuple[str, str], float] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, timings: RequestTimings):
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            self.durations.setdefault(key, _Histogram()).observe(seconds)
+            self.db_durations.setdefault(key, _Histogram()).observe(timings.db_seconds)
+            self.statements[key] = self.statements.get(key, 0) + timings.statements
+            self.hash_seconds[key] = self.hash_seconds.get(key, 0.0) + timings.hash_seconds
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            name = f"{PREFIX}_http_requests_total"
+            lines += [f"# HELP {name} Requests served", f"# TYPE {name} counter"]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"{name}{_labels(method=method, route=route, status=status)} {count}")
+            _render_histograms(lines, f"{PREFIX}_http_request_duration_seconds",
+                               "Request latency", self.durations)
+            _render_histograms(lines, f"{PREFIX}_http_request_db_duration_seconds",
+                               "Time per request spent executing SQL", self.db_durations)
+            name = f"{PREFIX}_http_request_db_statements_total"
+            lines += [f"# HELP {name} SQL statements executed by requests", f"# TYPE {name} counter"]
+            for (method, route), count in sorted(self.statements.items()):
+                lines.append(f"{name}{_labels(method=method, route=route)} {count}")
+            name = f"{PREFIX}_http_request_hash_seconds_total"
+            lines += [f"# HELP {name} Time requests spent on bcrypt, queueing included",
+                      f"# TYPE {name} counter"]
+            for (method, route), seconds in sorted(self.hash_seconds.items()):
+                lines.append(f"{name}{_labels(method=method, route=route)} {seconds:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _render_histograms(lines, name: str, help_text: str, histograms: Dict[Tuple[str, str], _Histogram]):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in sorted(histograms.items()):
+        for bound, count in zip(BUCKETS, histogram.counts):
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {count}")
+        lines.append(f"{name}_bucket{_labels(method=method, route=route, le='+Inf')} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {histogram.count}")
+
+
+def render_stats(name: str, stats: Dict[str, dict], label: str) -> str:
+    """Prometheus lines for a stats() dict of dicts, such as pool_metrics.stats()
+
+    Each numeric key becomes one metric, labelled with the outer key.
+    """
+    series: Dict[str, list] = {}
+    for label_value, values in stats.items():
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                series.setdefault(key, []).append((label_value, float(value)))
+    lines = []
+    for key, points in series.items():
+        metric = f"{PREFIX}_{name}_{key}"
+        lines.append(f"# TYPE {metric} untyped")
+        for label_value, value in points:
+            lines.append(f"{metric}{_labels(**{label: label_value})} {value:g}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+registry = MetricsRegistry()
+
+
+def _route_templates(app) -> Dict[object, str]:
+    templates = {}
+    for route in app.routes:
+        # Routes match by endpoint, mounts (e.g. /static) by app
+        target = getattr(route, "endpoint", None) or getattr(route, "app", None)
+        if target is not None and hasattr(route, "path"):
+            templates.setdefault(target, route.path or "/")
+    return templates
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware, so streamed bodies are timed in the request's context"""
+
+    def __init__(self, app):
+        self.app = app
+        self._templates: Optional[Dict[object, str]] = None
+
+    def _route(self, scope) -> str:
+        # The router records the matched endpoint in scope; nothing matched means 404
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._templates is None or endpoint not in self._templates:
+            self._templates = _route_templates(scope["app"])
+        return self._templates.get(endpoint, "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    header = timings.server_timing(time.perf_counter() - start)
+                    message = {**message, "headers": [*message.get("headers", ()),
+                                                      (b"server-timing", header.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            registry.observe(scope["method"], self._route(scope), status, time.perf_counter() - start, timings)
+
+
+def render(extra: Iterable[str] = ()) -> str:
+    """All request metrics, followed by the extra rendered sections"""
+    return registry.render() + "".join(extra)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -90,6 +90,7 @@ class ProductUpdate(BaseModel):
 
 class Product(ProductBase):
     id: int
+    tenure_months: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -97,6 +98,17 @@ class Product(ProductBase):
         from_attributes = True
 
 
+class ProductImportError(BaseModel):
+    line: int  # CSV line the rejected row ends on
+    detail: str
+
+class ProductImportResult(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    errors: List[ProductImportError]  # First rejected rows only
+
+
 # Application Schemas
 class ApplicationBase(BaseModel):
     product_id: int
@@ -112,13 +124,49 @@ class ApplicationBase(BaseModel):
 class ApplicationCreate(ApplicationBase):
     pass
 
+# Largest batch accepted by POST /applications/batch
+APPLICATION_BATCH_MAX_ROWS = 10000
+
+class ApplicationBatchCreate(BaseModel):
+    applications: List[ApplicationCreate] = Field(min_length=1, max_length=APPLICATION_BATCH_MAX_ROWS)
+
+class ApplicationBatchRow(BaseModel):
+    index: int  # Position in the submitted batch
+    status: str  # created, error
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class ApplicationBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: List[ApplicationBatchRow]
+
 class ApplicationUpdate(BaseModel):
     status: Optional[str] = None
     notes: Optional[str] = None
     reviewed_by: Optional[str] = None
 
+class ApplicationBulkStatus(BaseModel):
+    """Status change for the applications matching ids and/or the filters"""
+    status: str
+    reviewed_by: Optional[str] = None  # Defaults to the signed-in admin
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=APPLICATION_BATCH_MAX_ROWS)
+    status_filter: Optional[str] = None
+    product_id: Optional[int] = None
+    created_from: Optional[datetime] = None  # Inclusive
+    created_to: Optional[datetime] = None  # Exclusive
+    
+    @model_validator(mode="after")
+    def _require_selection(self):
+        # Never let an empty body update every application
+        selectors = (self.ids, self.status_filter, self.product_id, self.created_from, self.created_to)
+        if all(value is None for value in selectors):
+            raise ValueError("Provide ids or at least one filter")
+        return self
+
 class Application(ApplicationBase):
     id: int
+    tenure_months: Optional[int] = None
     status: str
     reviewed_by: Optional[str] = None
     reviewed_at: Optional[datetime] = None
@@ -135,3 +183,35 @@ class BankWithProducts(Bank):
 
 class ProductWithBank(Product):
     bank: Bank
+
+
+# Comparison Schemas
+class ProductCompareRequest(BaseModel):
+    principal: float = Field(gt=0)
+    tenure_months: Optional[int] = Field(default=None, gt=0)  # None = each product's own tenure
+    type: Optional[str] = None
+    limit: int = Field(default=100, gt=0, le=1000)
+
+class ProductComparison(BaseModel):
+    product_id: int
+    bank_id: int
+    bank_name: str
+    name: str
+    type: str
+    interest_rate: float
+    compounding_frequency: Optional[str] = None
+    tenure_months: int
+    maturity_amount: float
+    interest_earned: float
+    effective_annual_yield: float  # Percentage
+
+class ProductCompareResponse(BaseModel):
+    principal: float
+    total: int  # Matching products before the limit is applied
+    results: List[ProductComparison]
+
+
+# Pagination Schemas
+class ApplicationPage(BaseModel):
+    items: List[Application]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,35 @@
+"""
+Helpers for streaming large query results as response bodies.
+"""
+
+from typing import Callable, Iterator, List
+
+from database import SessionLocal
+
+
+class TextChunks:
+    """File-like sink for csv.writer whose output is handed out in chunks"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+
+    def write(self, text: str):
+        self.parts.append(text)
+
+    def drain(self) -> str:
+        text = "".join(self.parts)
+        self.parts.clear()
+        return text
+
+
+def with_session(export: Callable[..., Iterator[str]], *args) -> Iterator[str]:
+    """Yield from export(db, *args) on a session of its own
+
+    StreamingResponse produces the body after the endpoint has returned, so
+    the request's session cannot be used.
+    """
+    db = SessionLocal()
+    try:
+        yield from export(db, *args)
+    finally:
+        db.close()
@@ -0,0 +1,26 @@
+import re
+from typing import Optional
+
+# The whole text must be a number with an optional month or year unit
+_TENURE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(months?|mo|years?|yrs?)?\s*$", re.IGNORECASE)
+
+
+def parse_tenure_months(tenure: Optional[str]) -> Optional[int]:
+    """Parse a free-text tenure such as "12 months" or "2 years" into months
+
+    A bare number is taken as months. Decimals are accepted when they come to
+    a whole number of months ("1.5 years" is 18). Returns None for anything
+    else, including other units ("90 days", "3 weeks"), fractional months and
+    trailing text, rather than guess.
+    """
+    if not tenure:
+        return None
+    match = _TENURE_RE.match(tenure)
+    if not match:
+        return None
+    value = float(match.group(1))
+    unit = (match.group(2) or "month").lower()
+    months = value * 12 if unit.startswith("y") else value
+    if not months.is_integer():
+        return None
+    return int(months)
@@ -0,0 +1,98 @@
+"""
+Optional warm-up of a worker before it takes traffic (WARMUP=true).
+
+Run from the app's startup event, which uvicorn completes before it starts
+accepting connections. It:
+- opens WARMUP_CONNECTIONS connections (default: DB_POOL_SIZE) on each
+  engine and returns them to the pool, so the first requests find them open
+- sends each of WARMUP_PATHS (space-separated; default: the home page's
+  product grid, the bank list and the full product list) through the app
+  in-process, which fills the catalog cache and runs the first-call code
+  paths (query compilation, serializers) before a user has to wait on them
+
+Warm-up requests are counted in /metrics like any other. A failure is
+logged and does not stop startup; the worker then just serves its first
+requests cold.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import List
+
+from starlette.concurrency import run_in_threadpool
+
+import database
+
+logger = logging.getLogger(__name__)
+
+WARMUP = os.getenv("WARMUP", "false").lower() in ("1", "true", "yes")
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", str(database.POOL_OPTIONS["pool_size"])))
+WARMUP_PATHS = os.getenv(
+    "WARMUP_PATHS",
+    "/products?active_only=true&fields=type,interest_rate,min_deposit,tenure,key_features,bank.name"
+    " /banks /products"
+).split()
+
+
+def _open_connections(engine, count: int):
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def _open_async_connections(engine, count: int):
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(await engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+async def _get(app, path_and_query: str) -> int:
+    """GET a path through app in-process; the response status"""
+    path, _, query = path_and_query.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "server": ("warmup", 80), "client": ("127.0.0.1", 0), "root_path": "",
+        "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "headers": [(b"host", b"warmup")],
+    }
+    status = 500
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_up(app, paths: List[str] = WARMUP_PATHS):
+    """Open pool connections and prime the caches; returns the seconds taken"""
+    start = time.perf_counter()
+    try:
+        if WARMUP_CONNECTIONS:
+            await run_in_threadpool(_open_connections, database.engine, WARMUP_CONNECTIONS)
+            if database.async_engine is not None:
+                await _open_async_connections(database.async_engine, WARMUP_CONNECTIONS)
+        statuses = await asyncio.gather(*(_get(app, path) for path in paths))
+        for path, status in zip(paths, statuses):
+            if status >= 400:
+                logger.warning("Warm-up request %s returned %s", path, status)
+    except Exception as error:
+        logger.warning("Warm-up failed, serving cold: %s", error)
+    seconds = time.perf_counter() - start
+    logger.info("Warm-up took %.0f ms", seconds * 1000)
+    return seconds
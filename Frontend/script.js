@@ -118,7 +118,7 @@ async function loadDashboardStats() {
 
 async function loadBanks() {
     try {
-        const banks = await apiRequest('/banks');
+        const banks = await apiRequest('/banks?fields=name,products.id');
         displayBanks(banks);
     } catch (error) {
         console.error('Failed to load banks:', error);
@@ -264,7 +264,7 @@ function closeProductModal() {
 
 async function loadBanksForSelect() {
     try {
-        const banks = await apiRequest('/banks');
+        const banks = await apiRequest('/banks?fields=name');
         const select = document.getElementById('productBank');
         select.innerHTML = '<option value="">Choose a bank...</option>';
         banks.forEach(bank => {
@@ -390,7 +390,7 @@ async function deleteBank(bankId) {
 
 async function loadProducts() {
     try {
-        const products = await apiRequest('/products');
+        const products = await apiRequest('/products?fields=type,interest_rate,min_deposit,tenure,bank.name');
         displayProducts(products);
     } catch (error) {
         console.error('Failed to load products:', error);
@@ -428,7 +428,7 @@ function displayProducts(products) {
 
 async function addProduct() {
     try {
-        const banks = await apiRequest('/banks');
+        const banks = await apiRequest('/banks?fields=id');
         
         if (banks.length === 0) {
             alert('Please add a bank first!');
@@ -460,25 +460,83 @@ async function deleteProduct(productId) {
     }
 }
 
+function exportProductsCsv() {
+    window.location.href = `${API_BASE_URL}/admin/export/products`;
+}
+
+async function importProductsCsv(input) {
+    const file = input.files[0];
+    input.value = '';
+    if (!file) {
+        return;
+    }
+    
+    const formData = new FormData();
+    formData.append('file', file);
+    
+    try {
+        const response = await fetch(`${API_BASE_URL}/admin/import/products`, {
+            method: 'POST',
+            body: formData,
+            credentials: 'include'
+        });
+        const result = await response.json();
+        if (!response.ok) {
+            throw new Error(result.detail || 'Import failed');
+        }
+        
+        let message = `Import finished: ${result.created} created, ${result.updated} updated, ${result.failed} rejected.`;
+        if (result.errors.length) {
+            message += '\n\n' + result.errors.slice(0, 10).map(e => `Line ${e.line}: ${e.detail}`).join('\n');
+        }
+        alert(message);
+        loadProducts();
+        loadDashboardStats();
+    } catch (error) {
+        console.error('Failed to import products:', error);
+        alert('Error: ' + error.message);
+    }
+}
+
 // ==================== APPLICATION FUNCTIONS ====================
 
-async function loadApplications() {
+const APPLICATIONS_PAGE_SIZE = 50;
+let applicationsCursor = null;
+
+async function loadApplications(append = false) {
     try {
-        const applications = await apiRequest('/applications');
-        displayApplications(applications);
+        // Keyset pagination: an empty cursor requests the first page
+        const cursor = append ? applicationsCursor : '';
+        const page = await apiRequest(
+            `/applications?limit=${APPLICATIONS_PAGE_SIZE}&cursor=${encodeURIComponent(cursor)}`
+        );
+        applicationsCursor = page.next_cursor;
+        displayApplications(page.items, append);
     } catch (error) {
         console.error('Failed to load applications:', error);
     }
 }
 
-function displayApplications(applications) {
+function loadMoreApplications() {
+    if (applicationsCursor) {
+        loadApplications(true);
+    }
+}
+
+function displayApplications(applications, append = false) {
     const tbody = document.querySelector('#applications tbody');
     if (!tbody) return;
     
-    tbody.innerHTML = applications.map(app => {
+    const loadMoreBtn = document.getElementById('loadMoreApplicationsBtn');
+    if (loadMoreBtn) {
+        loadMoreBtn.style.display = applicationsCursor ? 'inline-block' : 'none';
+    }
+    
+    const rows = applications.map(app => {
         const date = new Date(app.created_at).toLocaleDateString();
         return `
         <tr>
+            <td><input type="checkbox" class="application-select" value="${app.id}" onchange="updateApplicationSelection()"></td>
             <td>${app.applicant_name}</td>
             <td>Product ID: ${app.product_id}</td>
             <td>${app.phone}</td>
@@ -502,6 +560,38 @@ function displayApplications(applications) {
             </td>
         </tr>
     `}).join('');
+    
+    if (append) {
+        tbody.insertAdjacentHTML('beforeend', rows);
+    } else {
+        tbody.innerHTML = rows;
+    }
+    updateApplicationSelection();
+}
+
+function getSelectedApplicationIds() {
+    return Array.from(document.querySelectorAll('.application-select:checked')).map(box => parseInt(box.value));
+}
+
+function toggleAllApplications(checked) {
+    document.querySelectorAll('.application-select').forEach(box => {
+        box.checked = checked;
+    });
+    updateApplicationSelection();
+}
+
+function updateApplicationSelection() {
+    const selected = getSelectedApplicationIds().length;
+    const total = document.querySelectorAll('.application-select').length;
+    
+    const count = document.getElementById('selectedApplicationsCount');
+    if (count) count.textContent = `${selected} selected`;
+    const selectAll = document.getElementById('selectAllApplications');
+    if (selectAll) selectAll.checked = total > 0 && selected === total;
+    ['bulkApproveBtn', 'bulkRejectBtn'].forEach(id => {
+        const btn = document.getElementById(id);
+        if (btn) btn.disabled = selected === 0;
+    });
 }
 
 async function viewApplication(appId) {
@@ -582,6 +672,22 @@ async function updateApplicationStatus(appId, status) {
     }
 }
 
+async function bulkUpdateApplicationStatus(status) {
+    const ids = getSelectedApplicationIds();
+    if (!ids.length || !confirm(`Mark ${ids.length} application(s) as ${status}?`)) {
+        return;
+    }
+    
+    try {
+        const updated = await apiRequest('/applications/bulk-status', 'POST', { status: status, ids: ids });
+        alert(`${updated.length} application(s) ${status} successfully!`);
+        loadApplications();
+        loadDashboardStats();
+    } catch (error) {
+        console.error('Failed to update applications:', error);
+    }
+}
+
 // ==================== HOME PAGE FUNCTIONS ====================
 
 // Load and display products on home page
@@ -593,8 +699,8 @@ async function loadHomeProducts() {
         
         if (!searchInput || !typeFilter || !tenureFilter) return;
         
-        // Add event listeners for filters
-        searchInput.addEventListener('input', filterProducts);
+        // Add event listeners for filters (debounce typing so a search is one request)
+        searchInput.addEventListener('input', debounce(filterProducts, SEARCH_DEBOUNCE_MS));
         typeFilter.addEventListener('change', filterProducts);
         tenureFilter.addEventListener('change', filterProducts);
         
@@ -605,44 +711,27 @@ async function loadHomeProducts() {
     }
 }
 
+let filterRequestId = 0;
+const HOME_PRODUCT_FIELDS = 'type,interest_rate,min_deposit,tenure,key_features,bank.name';
+
 async function filterProducts() {
     try {
-        const searchInput = document.getElementById('searchInput').value.toLowerCase();
+        const searchInput = document.getElementById('searchInput').value.trim();
         const typeFilter = document.getElementById('typeFilter').value;
         const tenureFilter = document.getElementById('tenureFilter').value;
         
-        // Build query params - only use type filter for backend
-        let endpoint = '/products?';
-        if (typeFilter) endpoint += `type=${encodeURIComponent(typeFilter)}&`;
+        // All filtering happens on the server; only the fields the cards show are fetched
+        const params = new URLSearchParams({ active_only: 'true', fields: HOME_PRODUCT_FIELDS });
+        if (searchInput) params.append('bank_name', searchInput);
+        if (typeFilter) params.append('type', typeFilter);
+        if (tenureFilter) params.append('tenure_months', tenureFilter);
         
-        const products = await apiRequest(endpoint);
+        // Ignore responses that arrive after a newer search was sent
+        const requestId = ++filterRequestId;
+        const products = await apiRequest(`/products?${params.toString()}`);
+        if (requestId !== filterRequestId) return;
         
-        // Filter on frontend
-        let filteredProducts = products;
-        
-        // Filter by search term (bank name)
-        if (searchInput) {
-            filteredProducts = filteredProducts.filter(p => 
-                p.bank.name.toLowerCase().includes(searchInput)
-            );
-        }
-        
-        // Filter by tenure (flexible matching)
-        if (tenureFilter) {
-            filteredProducts = filteredProducts.filter(p => {
-                const productTenure = p.tenure.toLowerCase();
-                const selectedTenure = tenureFilter.toLowerCase();
-                
-                // Extract numbers from both
-                const productMonths = parseInt(productTenure);
-                const selectedMonths = parseInt(selectedTenure);
-                
-                // Match if the months are equal
-                return productMonths === selectedMonths;
-            });
-        }
-        
-        displayHomeProducts(filteredProducts);
+        displayHomeProducts(products);
     } catch (error) {
         console.error('Failed to filter products:', error);
         document.getElementById('productsGrid').innerHTML = 
@@ -768,7 +857,8 @@ async function loadProductDetails(productId) {
         
         // Calculate estimated returns
         const rate = parseFloat(product.interest_rate) / 100;
-        const tenureInYears = parseTenureToYears(product.tenure);
+        const tenureInYears = product.tenure_months ?
+            product.tenure_months / 12 : parseTenureToYears(product.tenure);
         
         document.getElementById('return10k').textContent = 
             `৳${formatNumber(calculateMaturityAmount(10000, rate, tenureInYears))}`;
@@ -863,6 +953,16 @@ async function submitApplication(productId) {
 
 // ==================== HELPER FUNCTIONS ====================
 
+const SEARCH_DEBOUNCE_MS = 300;
+
+function debounce(fn, delay) {
+    let timer = null;
+    return function(...args) {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn.apply(this, args), delay);
+    };
+}
+
 function formatNumber(num) {
     if (!num) return '0';
     return num.toString().replace(/\B(?=(\d{3})+(?!\d))/g, ",");